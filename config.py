@@ -1,47 +1,97 @@
-import os
+import os, resource
+from typing import Any, Callable
+from modules.tracer import tracer
 import modules.adw as _
+from modules.template import blueprint_cache, prebuild_blueprints, resource_bundle
+
+with tracer.span("load resource bundle", "template"):
+    bundle_loaded = resource_bundle.load()
+if not bundle_loaded:
+    with tracer.span("prebuild blueprints", "template"):
+        prebuild_blueprints()
+
 import modules.modules as _
 import modules.overrides as _
 from ignis.app import IgnisApp
-from ignis.css_manager import CssInfoPath, CssManager
+from ignis.css_manager import CssInfoPath, CssInfoString, CssManager
 from ignis.services.niri import NiriService
-from ignis.utils import get_n_monitors, sass_compile
+from ignis.widgets import Window
+from loguru import logger
+from modules.constants import WindowName
 from modules.dbus import DBusServeur
 from modules.appdock import AppDock
 from modules.applauncher import AppLauncher
 from modules.backdrop import OverlayBackdrop
 from modules.controlcenter import ControlCenter, NotificationPopups
+from modules.css import cached_sass_compile
 from modules.fcitxkimpopup import FcitxKimPopup
+from modules.monitors import MonitorManager
 from modules.osd import OnscreenDisplay
 from modules.preferences import Preferences
+from modules.services import LazyService
 from modules.topbar import Topbar
+from modules.useroptions import user_options
 from modules.wallpaper import WallpaperWindow
+from modules.widgets import LazyWindow
 
 
 app = IgnisApp.get_initialized()
 css_manager = CssManager.get_default()
 niri = NiriService.get_default()
 DBusServeur.get_default()
+app.connect("shutdown", lambda *_: user_options.flush())
 
 config_dir = os.path.dirname(os.path.abspath(__file__))
-css_manager.apply_css(
-    CssInfoPath(
-        name="main", path=os.path.join(config_dir, "style.scss"), compiler_function=lambda path: sass_compile(path=path)
+main_css = resource_bundle.lookup_css("main")
+if main_css is not None:
+    css_manager.apply_css(CssInfoString(name="main", string=main_css))
+else:
+    css_manager.apply_css(
+        CssInfoPath(name="main", path=os.path.join(config_dir, "style.scss"), compiler_function=cached_sass_compile)
     )
-)
 
-AppLauncher()
-ControlCenter()
-FcitxKimPopup()
-NotificationPopups()
-OnscreenDisplay()
-Preferences()
 
-for idx in range(get_n_monitors()):
-    Topbar(idx)
-    AppDock(idx)
-    OverlayBackdrop(idx)
+def build_window(window_class: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    with tracer.span(window_class.__name__, "window", args=list(args), **kwargs):
+        return window_class(*args, **kwargs)
+
+
+# build on-demand windows when they are first opened
+lazy_windows = True
+# milliseconds before a closed preferences window is destroyed
+preferences_release_delay = 60 * 1000
+
+if lazy_windows:
+    LazyWindow(WindowName.app_launcher.value, AppLauncher)
+    LazyWindow(WindowName.control_center.value, ControlCenter)
+    LazyWindow(WindowName.preferences.value, Preferences, release_delay=preferences_release_delay)
+else:
+    build_window(AppLauncher)
+    build_window(ControlCenter)
+    build_window(Preferences)
 
-    WallpaperWindow(idx)
+# these are shown by service events rather than by the window manager
+build_window(FcitxKimPopup)
+build_window(NotificationPopups)
+build_window(OnscreenDisplay)
+
+
+def build_monitor_windows(idx: int, name: str) -> list[Window]:
+    windows = [
+        build_window(Topbar, idx, name=name),
+        build_window(AppDock, idx, name=name),
+        build_window(OverlayBackdrop, idx, name=name),
+        build_window(WallpaperWindow, idx, name=name),
+    ]
     if niri.is_available:
-        WallpaperWindow(idx, is_backdrop=True)
+        windows.append(build_window(WallpaperWindow, idx, is_backdrop=True, name=name))
+    return windows
+
+
+# per-monitor windows, rebuilt only for monitors that are plugged or unplugged
+MonitorManager(build_monitor_windows)
+
+logger.info(f"blueprint cache: {blueprint_cache.hits} hits, {blueprint_cache.misses} misses")
+logger.info(f"services started at startup: {LazyService.report()}")
+logger.info(f"resident memory after startup: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // 1024} MiB")
+tracer.finish()
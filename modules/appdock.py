@@ -1,3 +1,4 @@
+import time
 from gi.repository import Gdk, Gio, Gtk
 from ignis.menu_model import IgnisMenuItem, IgnisMenuModel, IgnisMenuSeparator, ItemsType
 from ignis.widgets import Window
@@ -10,12 +11,15 @@ from .template import gtk_template, gtk_template_child
 from .useroptions import user_options
 from .utils import (
     Pool,
+    app_index,
     connect_option,
+    disconnect_on_destroy,
     get_app_id,
     get_app_icon_name,
     get_widget_monitor,
     launch_application,
     niri_action,
+    on_destroy,
     set_on_click,
     set_on_scroll,
 )
@@ -320,7 +324,7 @@ class AppDockView(Gtk.Box):
             elif isinstance(window, HyprlandWindow):
                 self.__hypr.send_command(f"dispatch closewindow pid:{window.pid}")
 
-        def __launch_app(self, files: list[str] | None = None):
+        def __launch_app(self, files: list[str] | None = None, clicked_at: float | None = None):
             if not self.app_info:
                 return
 
@@ -328,16 +332,21 @@ class AppDockView(Gtk.Box):
             terminal_format = self.__app_options and self.__app_options.terminal_format
 
             launch_application(
-                self.app_info, files=files, command_format=command_format, terminal_format=terminal_format
+                self.app_info,
+                files=files,
+                command_format=command_format,
+                terminal_format=terminal_format,
+                clicked_at=clicked_at,
             )
 
         def __on_clicked(self, *_):
+            clicked_at = time.perf_counter()
             if self.niri_windows:
                 self.__focus_window(self.niri_windows[self.__idx])
             elif self.hypr_windows:
                 self.__focus_window(self.hypr_windows[self.__idx])
             elif self.app_info:
-                self.__launch_app()
+                self.__launch_app(clicked_at=clicked_at)
 
         def __on_right_clicked(self, *_):
             self.menu.popup()
@@ -400,29 +409,41 @@ class AppDockView(Gtk.Box):
         drop_target.connect("leave", self.__on_mouse_leave)
         self.add_controller(drop_target)
 
-        self.__apps.connect("notify::pinned", self.__on_pinned_changed)
+        # handlers on services and options, disconnected when the monitor is removed
+        handlers = disconnect_on_destroy(self)
+        on_destroy(self, self.__on_destroy)
+        handlers.append((self.__apps, self.__apps.connect("notify::pinned", self.__on_pinned_changed)))
         if self.__niri.is_available:
-            WindowFocusHistory.sync_windows(niri_windows=self.__niri.windows)
-            self.__niri.connect("notify::workspaces", self.__on_workspaces_changed)
-            self.__niri.connect("notify::windows", self.__on_windows_changed)
-            self.__niri.connect(
-                "notify::active-window", lambda *_: WindowFocusHistory.focus_window(self.__niri.active_window.id)
-            )
-            self.__niri.connect("notify::active-window", self.__on_windows_changed)
+            niri = self.__niri
+            WindowFocusHistory.sync_windows(niri_windows=niri.windows)
+            handlers.append((niri, niri.connect("notify::workspaces", self.__on_workspaces_changed)))
+            handlers.append((niri, niri.connect("notify::windows", self.__on_windows_changed)))
+            handlers.append((niri, niri.connect("notify::active-window", self.__on_niri_window_focused)))
+            handlers.append((niri, niri.connect("notify::active-window", self.__on_windows_changed)))
         if self.__hypr.is_available:
-            WindowFocusHistory.sync_windows(hypr_windows=self.__hypr.windows)
-            self.__hypr.connect("notify::workspaces", self.__on_workspaces_changed)
-            self.__hypr.connect("notify::windows", self.__on_windows_changed)
-            self.__hypr.connect(
-                "notify::active-window", lambda *_: WindowFocusHistory.focus_window(self.__hypr.active_window.pid)
-            )
-            self.__hypr.connect("notify::active-window", self.__on_windows_changed)
-            for monitor in self.__hypr.monitors:
-                monitor.connect("notify::active-workspace-id", self.__on_workspaces_changed)
+            hypr = self.__hypr
+            WindowFocusHistory.sync_windows(hypr_windows=hypr.windows)
+            handlers.append((hypr, hypr.connect("notify::workspaces", self.__on_workspaces_changed)))
+            handlers.append((hypr, hypr.connect("notify::windows", self.__on_windows_changed)))
+            handlers.append((hypr, hypr.connect("notify::active-window", self.__on_hypr_window_focused)))
+            handlers.append((hypr, hypr.connect("notify::active-window", self.__on_windows_changed)))
+            for monitor in hypr.monitors:
+                handlers.append((monitor, monitor.connect("notify::active-workspace-id", self.__on_workspaces_changed)))
         if self.__dock_options:
-            connect_option(self.__dock_options, "auto_conceal", self.__on_auto_conceal_changed)
-            connect_option(self.__dock_options, "monitor_only", self.__on_options_changed)
-            connect_option(self.__dock_options, "workspace_only", self.__on_options_changed)
+            handlers.append(connect_option(self.__dock_options, "auto_conceal", self.__on_auto_conceal_changed))
+            handlers.append(connect_option(self.__dock_options, "monitor_only", self.__on_options_changed))
+            handlers.append(connect_option(self.__dock_options, "workspace_only", self.__on_options_changed))
+
+    def __on_destroy(self):
+        if self.__defer_conceal:
+            self.__defer_conceal.cancel()
+            self.__defer_conceal = None
+
+    def __on_niri_window_focused(self, *_):
+        WindowFocusHistory.focus_window(self.__niri.active_window.id)
+
+    def __on_hypr_window_focused(self, *_):
+        WindowFocusHistory.focus_window(self.__hypr.active_window.pid)
 
     def __on_state_flags_changed(self, *_):
         flags = self.get_state_flags()
@@ -521,12 +542,11 @@ class AppDockView(Gtk.Box):
         # all the items to display: pinned apps and open windows
         app_id_set = pinned_set
         if self.__niri.is_available:
-            app_id_set = app_id_set | ({get_app_id(win.app_id) for win in self.__niri_wins})
+            app_id_set = app_id_set | ({app_index.resolve_id(win.app_id) for win in self.__niri_wins})
         if self.__hypr.is_available:
-            app_id_set = app_id_set | ({get_app_id(win.class_name) for win in self.__hypr_wins})
+            app_id_set = app_id_set | ({app_index.resolve_id(win.class_name) for win in self.__hypr_wins})
 
         # sync items to display
-        app_dict = {get_app_id(app.id): app for app in self.__apps.apps if app.id}
         for app_id in [app_id for app_id in self.__items if app_id not in app_id_set]:
             self.flow_box.remove(self.__items[app_id])
             self.__pool.release(self.__items.pop(app_id))
@@ -537,13 +557,13 @@ class AppDockView(Gtk.Box):
                 self.__items[app_id] = dock_item
                 self.flow_box.append(dock_item)
             dock_item.app_id = app_id
-            dock_item.app_info = app_dict.get(app_id)
+            dock_item.app_info = app_index.lookup(app_id)
 
         # sync open windows to items
         if self.__niri.is_available:
             niri_map: dict[str, list[NiriWindow]] = {}
             for win in self.__niri_wins:
-                app_id = get_app_id(win.app_id)
+                app_id = app_index.resolve_id(win.app_id)
                 if app_id not in niri_map:
                     niri_map[app_id] = []
                 niri_map[app_id].append(win)
@@ -552,7 +572,7 @@ class AppDockView(Gtk.Box):
         if self.__hypr.is_available:
             hypr_map: dict[str, list[HyprlandWindow]] = {}
             for win in self.__hypr_wins:
-                app_id = get_app_id(win.class_name)
+                app_id = app_index.resolve_id(win.class_name)
                 if app_id not in hypr_map:
                     hypr_map[app_id] = []
                 hypr_map[app_id].append(win)
@@ -568,10 +588,10 @@ class AppDockView(Gtk.Box):
 class AppDock(Window):
     __gtype_name__ = "IgnisAppDock"
 
-    def __init__(self, monitor: int = 0):
+    def __init__(self, monitor: int = 0, name: str | None = None):
         self.__options = user_options and user_options.appdock
         super().__init__(
-            namespace=f"{WindowName.app_dock.value}-{monitor}",
+            namespace=f"{WindowName.app_dock.value}-{monitor if name is None else name}",
             monitor=monitor,
             anchor=["bottom"],
             css_classes=["rounded-tl", "rounded-tr", "transparent"],
@@ -581,8 +601,11 @@ class AppDock(Window):
         self.set_child(self.__view)
 
         if self.__options:
-            connect_option(self.__options, "exclusive", self.__on_exclusive_changed)
-            connect_option(self.__options, "focusable", self.__on_focusable_changed)
+            disconnect_on_destroy(
+                self,
+                connect_option(self.__options, "exclusive", self.__on_exclusive_changed),
+                connect_option(self.__options, "focusable", self.__on_focusable_changed),
+            )
             self.__on_exclusive_changed()
 
     def __on_exclusive_changed(self, *_):
@@ -1,3 +1,4 @@
+import time
 from typing import Any, Callable
 from gi.repository import Gio, GObject, Gtk
 from ignis.menu_model import IgnisMenuItem, IgnisMenuModel, IgnisMenuSeparator, ItemsType
@@ -30,18 +31,18 @@ class AppLauncherGridItem(Gtk.Box):
         set_on_click(self, left=self.__on_left_click, right=self.__on_right_click)
 
     def __on_left_click(self, *_):
-        self.__launch_app()
+        self.__launch_app(clicked_at=time.perf_counter())
 
     def __on_right_click(self, *_):
         self.menu.popup()
 
-    def __launch_app(self):
+    def __launch_app(self, clicked_at: float | None = None):
         if not self.application:
             return
 
         view = self.get_ancestor(AppLauncherView)
         if isinstance(view, AppLauncherView):
-            view.launch_application(self.application)
+            view.launch_application(self.application, clicked_at=clicked_at)
             view.on_search_stop()
 
     def __launch_action(self, action: ApplicationAction):
@@ -123,14 +124,17 @@ class AppLauncherView(Gtk.Box):
     list_store: Gio.ListStore = gtk_template_child()
 
     class Factory(Gtk.SignalListItemFactory):
+        __pool = Pool(AppLauncherGridItem, max_idle=64, prewarm=32)
+
         def __init__(self):
             super().__init__()
 
-            self.__pool = Pool(AppLauncherGridItem)
             # we don't connect to "setup" or "teardown" signals
             # instead we acquire and release childs in "bind" and "unbind"
             self.connect("bind", self.__item_bind)
             self.connect("unbind", self.__item_unbind)
+            # built along with the launcher window, so nothing is prewarmed before the launcher is first opened
+            self.__pool.prewarm()
 
         def __item_bind(self, _, item: Gtk.ListItem):
             self.__item_unbind(_, item)
@@ -169,10 +173,10 @@ class AppLauncherView(Gtk.Box):
         for app in apps:
             self.list_store.append(app)
 
-    def launch_application(self, app: Application):
+    def launch_application(self, app: Application, clicked_at: float | None = None):
         command_format = self.__app_options and self.__app_options.command_format
         terminal_format = self.__app_options and self.__app_options.terminal_format
-        launch_application(app, command_format=command_format, terminal_format=terminal_format)
+        launch_application(app, command_format=command_format, terminal_format=terminal_format, clicked_at=clicked_at)
 
     def __move_selection(self, delta: int):
         pos, count = self.selection.get_selected(), self.selection.get_n_items()
@@ -206,9 +210,10 @@ class AppLauncherView(Gtk.Box):
 
     @gtk_template_callback
     def on_item_activate(self, _: Gtk.ListView, pos: int):
+        activated_at = time.perf_counter()
         item = self.selection.get_item(pos)
         if isinstance(item, Application):
-            self.launch_application(item)
+            self.launch_application(item, clicked_at=activated_at)
         self.on_search_stop()
 
     @gtk_template_callback
@@ -2,7 +2,7 @@ from ignis.widgets import Box, Revealer
 from ignis.window_manager import WindowManager
 from ignis.variable import Variable
 from .constants import WindowName
-from .utils import set_on_click
+from .utils import disconnect_on_destroy, set_on_click
 from .widgets import RevealerWindow
 
 
@@ -40,7 +40,7 @@ overlay_window = OverlayWindow()
 class OverlayBackdrop(RevealerWindow):
     __gtype_name__ = "IgnisBackdrop"
 
-    def __init__(self, monitor: int):
+    def __init__(self, monitor: int, name: str | None = None):
         self.__revealer = Revealer(
             hexpand=True,
             vexpand=True,
@@ -50,7 +50,7 @@ class OverlayBackdrop(RevealerWindow):
         self.__view = Box(hexpand=True, vexpand=True, child=[self.__revealer])
 
         super().__init__(
-            namespace=f"{WindowName.backdrop.value}-{monitor}",
+            namespace=f"{WindowName.backdrop.value}-{monitor if name is None else name}",
             monitor=monitor,
             exclusivity="ignore",
             anchor=["top", "right", "bottom", "left"],
@@ -61,7 +61,8 @@ class OverlayBackdrop(RevealerWindow):
             revealer=self.__revealer,
         )
 
-        overlay_window.connect("notify::value", self.__on_overlay_window_changed)
+        overlay_id = overlay_window.connect("notify::value", self.__on_overlay_window_changed)
+        disconnect_on_destroy(self, (overlay_window, overlay_id))
         set_on_click(
             self.__view,
             left=self.__on_backdrop_clicked,
@@ -2,7 +2,7 @@ import math
 import urllib.parse
 from asyncio import create_task
 from datetime import datetime
-from typing import Any
+from typing import Any, Callable
 from gi.repository import Adw, Gio, GLib, Gtk
 from ignis.widgets import Icon, Window
 from ignis.window_manager import WindowManager
@@ -16,6 +16,7 @@ from ignis.services.recorder import RecorderConfig, RecorderService
 from ignis.options import options
 from .backdrop import overlay_window
 from .constants import AudioStreamType, WindowName
+from .services import LazyService
 from .variables import caffeine_state
 from .template import gtk_template, gtk_template_callback, gtk_template_child
 from .useroptions import user_options
@@ -23,6 +24,7 @@ from .utils import (
     Pool,
     clear_dir,
     connect_window,
+    connect_mapped,
     connect_option,
     escape_pango_markup,
     gproperty,
@@ -144,6 +146,8 @@ class AudioControlGroup(Gtk.Box):
                 case AudioStreamType.microphone:
                     self.__service.microphone = self._stream
 
+    __pool = Pool(AudioControlStream, prewarm=4)
+
     def __init__(self, stream_type: AudioStreamType):
         self.__service = AudioService.get_default()
         self._stream_type = stream_type
@@ -151,12 +155,13 @@ class AudioControlGroup(Gtk.Box):
         self._streams = Gio.ListStore()
 
         super().__init__()
-        self.__pool = Pool(self.AudioControlStream)
         self.list_box.bind_model(model=self._streams, create_widget_func=lambda item: item)
 
         set_on_click(self.icon, left=self.__on_mute_clicked)
         set_on_click(self.caption, left=self.__on_caption_clicked)
         connect_window(self, "notify::visible", self.__on_window_visible_change)
+        # built along with the control center window
+        self.__pool.prewarm()
 
         match stream_type:
             case AudioStreamType.speaker:
@@ -307,18 +312,21 @@ class BacklightControlGroup(Gtk.ListBox):
                 self.scale.set_value(self._device.brightness)
 
     def __init__(self):
-        self.__service = BacklightService.get_default()
+        self.__service = LazyService(BacklightService)
         super().__init__()
 
         self.__list = Gio.ListStore()
         self.bind_model(self.__list, lambda i: i)
 
         self.__pool = Pool(self.Item)
-        self.__service.connect("notify::devices", self.__on_devices_changed)
+        connect_mapped(self, self.__on_mapped)
+
+    def __on_mapped(self):
+        self.__service.get().connect("notify::devices", self.__on_devices_changed)
         self.__on_devices_changed()
 
     def __on_devices_changed(self, *_):
-        devices = self.__service.devices
+        devices = self.__service.get().devices
 
         for item in self.__list:
             item.device = None
@@ -536,7 +544,7 @@ class IgnisRecorder(Gtk.Box):
 
     def __init__(self):
         self.__niri = NiriService.get_default()
-        self.__service = RecorderService.get_default()
+        self.__service = LazyService(RecorderService)
         super().__init__()
 
         self.__pill = ControlSwitchPill()
@@ -545,15 +553,19 @@ class IgnisRecorder(Gtk.Box):
         self.__pill.set_subtitle("screen recorder")
         self.set_tooltip_text("Click to start/stop; right click to pause")
 
-        self.__service.connect("notify::active", self.__on_status_changed)
-        self.__service.connect("notify::is-paused", self.__on_status_changed)
         set_on_click(self, left=self.__on_clicked, right=self.__on_right_clicked)
+        connect_mapped(self, self.__on_mapped)
+
+    def __on_mapped(self):
+        service = self.__service.get()
+        service.connect("notify::active", self.__on_status_changed)
+        service.connect("notify::is-paused", self.__on_status_changed)
         self.__on_status_changed()
 
     def __on_status_changed(self, *_):
-        if self.__service.active:
+        if self.__service.get().active:
             self.__pill.set_style_accent(True)
-            if self.__service.is_paused:
+            if self.__service.get().is_paused:
                 self.__pill.set_style_warning(True)
                 self.__pill.icon.set_from_icon_name("media-playback-pause-symbolic")
             else:
@@ -565,21 +577,21 @@ class IgnisRecorder(Gtk.Box):
             self.__pill.icon.set_from_icon_name("screencast-recorded-symbolic")
 
     def __on_clicked(self, *_):
-        if self.__service.active:
-            if self.__service.is_paused:
-                self.__service.continue_recording()
+        if self.__service.get().active:
+            if self.__service.get().is_paused:
+                self.__service.get().continue_recording()
             else:
-                self.__service.stop_recording()
+                self.__service.get().stop_recording()
         else:
             wm.close_window(WindowName.control_center.value)
-            create_task(self.__service.start_recording(RecorderConfig.new_from_options()))
+            create_task(self.__service.get().start_recording(RecorderConfig.new_from_options()))
 
     def __on_right_clicked(self, *_):
-        if self.__service.active:
-            if self.__service.is_paused:
-                self.__service.continue_recording()
+        if self.__service.get().active:
+            if self.__service.get().is_paused:
+                self.__service.get().continue_recording()
             else:
-                self.__service.pause_recording()
+                self.__service.get().pause_recording()
 
 
 class DndSwitch(Gtk.Box):
@@ -650,14 +662,17 @@ class EthernetStatus(Gtk.Box):
     __gtype_name__ = "EthernetStatus"
 
     def __init__(self):
-        self.__service = NetworkService.get_default()
-        self.__ethernet = self.__service.ethernet
+        self.__service = LazyService(NetworkService)
         super().__init__()
 
         self.__pill = ControlSwitchPill()
         self.append(self.__pill)
         self.__pill.set_title("Ethernet")
 
+        connect_mapped(self, self.__on_mapped)
+
+    def __on_mapped(self):
+        self.__ethernet = self.__service.get().ethernet
         self.__ethernet.connect("notify::icon-name", self.__on_status_changed)
         self.__ethernet.connect("notify::devices", self.__on_status_changed)
         self.__on_status_changed()
@@ -688,14 +703,17 @@ class WifiStatus(Gtk.Box):
     __gtype_name__ = "WifiStatus"
 
     def __init__(self):
-        self.__service = NetworkService.get_default()
-        self.__wifi = self.__service.wifi
+        self.__service = LazyService(NetworkService)
         super().__init__()
 
         self.__pill = ControlSwitchPill()
         self.append(self.__pill)
         self.__pill.set_title("Wifi")
 
+        connect_mapped(self, self.__on_mapped)
+
+    def __on_mapped(self):
+        self.__wifi = self.__service.get().wifi
         self.__wifi.connect("notify::icon-name", self.__on_status_changed)
         self.__wifi.connect("notify::devices", self.__on_status_changed)
         set_on_click(self, left=self.__on_clicked)
@@ -734,16 +752,20 @@ class BluetoothStatus(Gtk.Box):
     __gtype_name__ = "BluetoothStatus"
 
     def __init__(self):
-        self.__service = BluetoothService.get_default()
+        self.__service = LazyService(BluetoothService)
         super().__init__()
 
         self.__pill = ControlSwitchPill()
         self.append(self.__pill)
         self.__pill.set_title("Bluetooth")
 
-        self.__service.connect("notify::state", self.__on_status_changed)
-        self.__service.connect("notify::devices", self.__on_devices_changed)
         self.__devices_signals: list[tuple[BluetoothDevice, int]] = []
+        connect_mapped(self, self.__on_mapped)
+
+    def __on_mapped(self):
+        service = self.__service.get()
+        service.connect("notify::state", self.__on_status_changed)
+        service.connect("notify::devices", self.__on_devices_changed)
         set_on_click(self, left=self.__on_clicked)
 
     def __on_devices_changed(self, *_):
@@ -751,19 +773,19 @@ class BluetoothStatus(Gtk.Box):
             device.disconnect(id)
         self.__devices_signals.clear()
 
-        for device in self.__service.devices:
+        for device in self.__service.get().devices:
             id = device.connect("notify::connected", self.__on_status_changed)
             self.__devices_signals.append((device, id))
 
     def __on_status_changed(self, *_):
-        if not self.__service.powered:
+        if not self.__service.get().powered:
             self.__pill.set_subtitle("disabled")
             self.__pill.icon.set_from_icon_name("bluetooth-disabled-symbolic")
             self.__pill.set_style_accent(False)
             return
 
         self.__pill.set_style_accent(True)
-        devices = [device for device in self.__service.devices if device.connected]
+        devices = [device for device in self.__service.get().devices if device.connected]
         match len(devices):
             case 0:
                 self.__pill.set_subtitle("disconnected")
@@ -777,7 +799,7 @@ class BluetoothStatus(Gtk.Box):
                 self.__pill.set_subtitle(f"{len(devices)} devices")
 
     def __on_clicked(self, *_):
-        self.__service.powered = not self.__service.powered
+        self.__service.get().powered = not self.__service.get().powered
 
 
 @gtk_template("controlcenter/notification-item")
@@ -795,8 +817,10 @@ class NotificationItem(Gtk.ListBoxRow):
         self._is_popup = False
         super().__init__()
 
-        self.__pool = Pool(Gtk.Button)
+        self.__pool = Pool(Gtk.Button, name="NotificationItem.action", max_idle=4)
         self.__action_signals: list[tuple[Gtk.Button, int]] = []
+        self.__on_folded: Callable[[], Any] | None = None
+        # connected once, as items are recycled between the notification center and popups
         self.revealer.connect("notify::child-revealed", self.__on_child_revealed)
         self.connect("map", lambda *_: self.revealer.set_reveal_child(True))
         set_on_click(self.action_row, left=self.__on_clicked, right=self.__on_right_clicked)
@@ -818,6 +842,7 @@ class NotificationItem(Gtk.ListBoxRow):
         for button, id in self.__action_signals:
             button.disconnect(id)
         self.__action_signals.clear()
+        self.__on_folded = None
 
         self._notification = notify
         self.__update_urgency(notify)
@@ -877,12 +902,24 @@ class NotificationItem(Gtk.ListBoxRow):
             else:
                 self.remove_css_class(css_class)
 
+    def fold(self, on_folded: Callable[[], Any]):
+        """
+        hides the item with a transition, and calls `on_folded` once it is hidden
+        """
+        self.__on_folded = on_folded
+        self.revealer.set_reveal_child(False)
+
     def __on_child_revealed(self, *_):
         if self.revealer.get_reveal_child():
             self.revealer.set_transition_type(Gtk.RevealerTransitionType.SLIDE_UP)
         else:
             self.revealer.set_transition_type(Gtk.RevealerTransitionType.SLIDE_DOWN)
 
+        on_folded = self.__on_folded
+        if on_folded and not self.revealer.get_child_revealed():
+            self.__on_folded = None
+            on_folded()
+
     def __on_clicked(self, *_):
         if not self.revealer.get_reveal_child():
             return
@@ -909,6 +946,9 @@ class NotificationItem(Gtk.ListBoxRow):
         return callback
 
 
+notification_item_pool = Pool(NotificationItem, prewarm=8)
+
+
 @gtk_template("controlcenter/notificationcenter")
 class NotificationCenter(Gtk.Box):
     __gtype_name__ = "NotificationCenter"
@@ -923,7 +963,9 @@ class NotificationCenter(Gtk.Box):
         self._notifications = Gio.ListStore()
         self.list_box.bind_model(model=self._notifications, create_widget_func=lambda i: i)
 
-        self.__pool = Pool(NotificationItem)
+        self.__pool = notification_item_pool
+        # built along with the control center window, popups alone do not prewarm
+        self.__pool.prewarm()
         self._notifications.connect("notify::n-items", self.__on_store_changed)
         self.__service.connect("notified", self.__on_notified)
 
@@ -964,14 +1006,13 @@ class NotificationCenter(Gtk.Box):
             self._notifications.remove(pos)
             return
 
-        def on_child_folded(*_):
+        def on_folded():
             found, pos = self.__find_notify(notify)
             if found:
                 self._notifications.remove(pos)
                 self.__pool.release(item)
 
-        item.revealer.set_reveal_child(False)
-        item.revealer.connect("notify::child-revealed", on_child_folded)
+        item.fold(on_folded)
 
     @gtk_template_callback
     def on_clear_all_clicked(self, *_):
@@ -1008,7 +1049,7 @@ class NotificationPopups(RevealerWindow):
         self._popups = Gio.ListStore()
         self.__view.list_box.bind_model(model=self._popups, create_widget_func=lambda i: i)
 
-        self.__pool = Pool(NotificationItem)
+        self.__pool = notification_item_pool
         self._popups.connect("notify::n-items", self.__on_store_changed)
         self.__service.connect("new_popup", self.__on_new_popup)
 
@@ -1041,14 +1082,13 @@ class NotificationPopups(RevealerWindow):
             self._popups.remove(pos)
             return
 
-        def on_child_folded(*_):
+        def on_folded():
             found, pos = self.__find_popup(popup)
             if found:
                 self._popups.remove(pos)
                 self.__pool.release(item)
 
-        item.revealer.set_reveal_child(False)
-        item.revealer.connect("notify::child-revealed", on_child_folded)
+        item.fold(on_folded)
 
 
 class ControlCenter(RevealerWindow):
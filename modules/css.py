@@ -0,0 +1,80 @@
+import hashlib, os, re
+from loguru import logger
+from ignis import CACHE_DIR
+from ignis.utils import sass_compile
+from .tracer import tracer
+
+
+cache_css_path = os.path.join(CACHE_DIR, "css")
+scss_import_pattern = re.compile(r"""^\s*@(?:use|forward|import)\s+["']([^"']+)["']""", re.MULTILINE)
+
+
+def resolve_scss_import(dirname: str, name: str) -> str | None:
+    if name.startswith("sass:"):
+        return None
+
+    head, tail = os.path.split(name)
+    for candidate in [name, f"{name}.scss", os.path.join(head, f"_{tail}.scss"), os.path.join(name, "_index.scss")]:
+        filename = os.path.join(dirname, candidate)
+        if os.path.isfile(filename):
+            return filename
+    return None
+
+
+def scss_sources(path: str) -> list[str]:
+    """
+    `path` and all `.scss` files it imports, recursively
+    """
+    sources: list[str] = []
+    pending = [os.path.realpath(path)]
+    while pending:
+        filename = pending.pop()
+        if filename in sources:
+            continue
+
+        sources.append(filename)
+        with open(filename) as file:
+            content = file.read()
+        for name in scss_import_pattern.findall(content):
+            imported = resolve_scss_import(os.path.dirname(filename), name)
+            if imported:
+                pending.append(os.path.realpath(imported))
+    return sources
+
+
+def scss_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    for filename in sorted(scss_sources(path)):
+        digest.update(filename.encode())
+        with open(filename, "rb") as file:
+            digest.update(hashlib.sha256(file.read()).digest())
+    return digest.hexdigest()
+
+
+def cached_sass_compile(path: str) -> str:
+    """
+    `sass_compile`, but the result is cached by the content of `path` and all its imports
+    """
+    name = os.path.splitext(os.path.basename(path))[0]
+    css_filename = os.path.join(cache_css_path, f"{name}-{scss_hash(path)[:16]}.css")
+
+    try:
+        with open(css_filename) as file:
+            return file.read()
+    except FileNotFoundError:
+        pass
+
+    with tracer.span("sass compile", "css", path=path):
+        css = sass_compile(path=path)
+
+    os.makedirs(cache_css_path, exist_ok=True)
+    for file in os.listdir(cache_css_path):
+        # drop outdated results of the same stylesheet
+        if file.startswith(f"{name}-") and file.endswith(".css"):
+            os.remove(os.path.join(cache_css_path, file))
+    with open(css_filename + ".tmp", "w") as file:
+        file.write(css)
+    os.replace(css_filename + ".tmp", css_filename)
+    logger.info(f"compiled css cached: {css_filename}")
+
+    return css
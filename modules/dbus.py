@@ -1,17 +1,23 @@
 import asyncio
+import json
 import os
+from gi.repository import GLib
+from loguru import logger
 from ignis.dbus import DBusService
 from ignis.window_manager import WindowManager
 from ignis.base_service import BaseService
 from ignis.services.recorder import RecorderConfig, RecorderService
 from ignis.utils import load_interface_xml
 from .constants import WindowName
-from .services import FcitxStateService
+from .css import cached_sass_compile
+from .services import FcitxStateService, LazyService, SystemSampler
+from .template import config_dir, resource_bundle
 from .useroptions import user_options
+from .utils import Pool, app_icon_cache, command_executor, launch_stats, option_dispatcher
 
 
 wm = WindowManager.get_default()
-recorder = RecorderService.get_default()
+recorder_service = LazyService(RecorderService)
 fcitx = FcitxStateService.get_default()
 
 
@@ -28,6 +34,8 @@ class DBusServeur(BaseService):
             ),
         )
         self.__register_methods(self.__bus)
+        self.__build_task: asyncio.Task | None = None
+        self.__build_again = False
 
     def __register_methods(self, dbus: DBusService):
         dbus.register_dbus_method("ToggleAppLauncher", self.__dbus_toggle_applauncher)
@@ -40,6 +48,8 @@ class DBusServeur(BaseService):
         dbus.register_dbus_method("PauseRecording", self.__dbus_pause_recording)
         dbus.register_dbus_method("ContinueRecording", self.__dbus_continue_recording)
         dbus.register_dbus_method("OpenSettings", self.__dbus_open_settings)
+        dbus.register_dbus_method("BuildResources", self.__dbus_build_resources)
+        dbus.register_dbus_method("Stats", self.__dbus_stats)
 
     def __dbus_toggle_applauncher(self, _):
         wm.toggle_window(WindowName.app_launcher.value)
@@ -53,6 +63,7 @@ class DBusServeur(BaseService):
             opts.auto_conceal = not opts.auto_conceal
 
     def __dbus_toggle_recording(self, _):
+        recorder = recorder_service.get()
         if recorder.active:
             if recorder.is_paused:
                 recorder.continue_recording()
@@ -62,14 +73,17 @@ class DBusServeur(BaseService):
             asyncio.create_task(recorder.start_recording(RecorderConfig.new_from_options()))
 
     def __dbus_start_recording(self, _):
+        recorder = recorder_service.get()
         if not recorder.active:
             asyncio.create_task(recorder.start_recording(RecorderConfig.new_from_options()))
 
     def __dbus_stop_recording(self, _):
+        recorder = recorder_service.get()
         if recorder.active:
             recorder.stop_recording()
 
     def __dbus_toggle_pause_recording(self, _):
+        recorder = recorder_service.get()
         if recorder.active:
             if recorder.is_paused:
                 recorder.continue_recording()
@@ -77,12 +91,51 @@ class DBusServeur(BaseService):
                 recorder.pause_recording()
 
     def __dbus_pause_recording(self, _):
+        recorder = recorder_service.get()
         if recorder.active and not recorder.is_paused:
             recorder.pause_recording()
 
     def __dbus_continue_recording(self, _):
+        recorder = recorder_service.get()
         if recorder.active and recorder.is_paused:
             recorder.continue_recording()
 
     def __dbus_open_settings(self, _):
         wm.open_window(WindowName.preferences.value)
+
+    def __dbus_build_resources(self, _):
+        if self.__build_task is None or self.__build_task.done():
+            self.__build_task = asyncio.create_task(self.__build_resources())
+        else:
+            # sources may have changed since the running build started
+            self.__build_again = True
+
+    async def __build_resources(self):
+        """
+        runs sass, blueprint-compiler and glib-compile-resources in a thread, off the main loop
+        """
+
+        def build():
+            css = cached_sass_compile(os.path.join(config_dir, "style.scss"))
+            resource_bundle.build(css={"main": css})
+
+        while True:
+            self.__build_again = False
+            try:
+                await asyncio.to_thread(build)
+            except Exception as e:
+                logger.warning(f"failed to build resources: {e}")
+            if not self.__build_again:
+                break
+
+    def __dbus_stats(self, _) -> GLib.Variant:
+        stats = {
+            "pools": Pool.report(),
+            "icons": app_icon_cache.stats(),
+            "launches": launch_stats.stats(),
+            "commands": command_executor.stats(),
+            "options": option_dispatcher.stats(),
+            "user_options": user_options.stats(),
+            "sampler": SystemSampler.get_default().stats(),
+        }
+        return GLib.Variant("(s)", (json.dumps(stats),))
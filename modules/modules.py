@@ -1,6 +1,7 @@
 import asyncio
-import datetime, math
-from typing import Callable
+import datetime
+import os
+from typing import Any, Callable
 from gi.repository import Gio, GObject, Gtk
 from ignis.app import IgnisApp
 from ignis.widgets import Box, Icon, Label, PopoverMenu, Window
@@ -16,16 +17,19 @@ from ignis.services.upower import UPowerDevice, UPowerService
 from ignis.dbus_menu import DBusMenu
 from ignis.menu_model import IgnisMenuItem, IgnisMenuModel, IgnisMenuSeparator, ItemsType
 from ignis.options import options
-from ignis.utils import Poll
 from .constants import WindowName
 from .variables import caffeine_state
-from .services import CpuLoadService, FcitxStateService
+from .services import CpuLoadService, FcitxStateService, LazyService, MemoryService, SystemSampler
 from .template import gtk_template, gtk_template_callback, gtk_template_child
 from .useroptions import user_options
 from .utils import (
     Pool,
     clear_dir,
+    compile_command,
+    connect_mapped,
     connect_option,
+    disconnect_handlers,
+    disconnect_on_destroy,
     format_time_duration,
     get_app_id,
     get_app_icon_name,
@@ -33,6 +37,7 @@ from .utils import (
     get_widget_monitor,
     gproperty,
     niri_action,
+    on_destroy,
     run_cmd_async,
     set_on_click,
     set_on_scroll,
@@ -52,12 +57,31 @@ class ActiveWindow(Gtk.CenterBox):
     icon: Gtk.Image = gtk_template_child()
     label: Gtk.Label = gtk_template_child()
 
+    command_options = [
+        "on_click",
+        "on_right_click",
+        "on_middle_click",
+        "on_scroll_up",
+        "on_scroll_down",
+        "on_scroll_left",
+        "on_scroll_right",
+    ]
+
     def __init__(self):
         self.__niri = NiriService.get_default()
         self.__hypr = HyprlandService.get_default()
         super().__init__()
 
         self.__options = user_options and user_options.activewindow
+        # dict[option name, compiled command]
+        self.__commands: dict[str, Callable[[], Any]] = {}
+        handlers = disconnect_on_destroy(self)
+        if self.__options:
+            for option in self.command_options:
+                self.__compile_command(option)
+                handlers.append(
+                    connect_option(self.__options, option, lambda *_, option=option: self.__compile_command(option))
+                )
 
         set_on_click(
             self,
@@ -68,10 +92,10 @@ class ActiveWindow(Gtk.CenterBox):
         set_on_scroll(self, self.__on_scroll)
 
         if self.__niri.is_available:
-            self.__niri.connect("notify::active-window", self.__on_change)
+            handlers.append((self.__niri, self.__niri.connect("notify::active-window", self.__on_change)))
 
         if self.__hypr.is_available:
-            self.__hypr.connect("notify::active-window", self.__on_change)
+            handlers.append((self.__hypr, self.__hypr.connect("notify::active-window", self.__on_change)))
 
     @property
     def has_active_window(self) -> bool:
@@ -109,32 +133,37 @@ class ActiveWindow(Gtk.CenterBox):
         self.label.set_label(label)
         self.set_tooltip_text(tooltip)
 
+    def __compile_command(self, option: str):
+        cmd: str = getattr(self.__options, option)
+        if cmd == "":
+            self.__commands.pop(option, None)
+        else:
+            key = "active-window-scroll" if option.startswith("on_scroll") else None
+            self.__commands[option] = compile_command(cmd, key)
+
+    def __run_command(self, option: str):
+        command = self.__commands.get(option)
+        if command:
+            command()
+
     def __on_click(self, key: str = "LEFT"):
-        if self.__options:
-            cmd: str = ""
-            match key:
-                case "LEFT":
-                    cmd = self.__options.on_click
-                case "RIGHT":
-                    cmd = self.__options.on_right_click
-                case "MIDDLE":
-                    cmd = self.__options.on_middle_click
-            if cmd != "":
-                run_cmd_async(cmd)
+        match key:
+            case "LEFT":
+                self.__run_command("on_click")
+            case "RIGHT":
+                self.__run_command("on_right_click")
+            case "MIDDLE":
+                self.__run_command("on_middle_click")
 
     def __on_scroll(self, _, dx: float, dy: float):
-        if self.__options:
-            cmd: str = ""
-            if dx < 0:
-                cmd = self.__options.on_scroll_left
-            elif dx > 0:
-                cmd = self.__options.on_scroll_right
-            elif dy < 0:
-                cmd = self.__options.on_scroll_up
-            elif dy > 0:
-                cmd = self.__options.on_scroll_down
-            if cmd != "":
-                run_cmd_async(cmd)
+        if dx < 0:
+            self.__run_command("on_scroll_left")
+        elif dx > 0:
+            self.__run_command("on_scroll_right")
+        elif dy < 0:
+            self.__run_command("on_scroll_up")
+        elif dy > 0:
+            self.__run_command("on_scroll_down")
 
 
 class Workspaces(Box):
@@ -154,10 +183,6 @@ class Workspaces(Box):
             self.append(self.icon)
 
             set_on_click(self, left=self.__on_clicked)
-            if self.__niri.is_available:
-                self.__niri.connect("notify::active-workspace", self.__on_changed)
-            if self.__hypr.is_available:
-                self.__hypr.connect("notify::active-workspace", self.__on_changed)
 
         @property
         def is_active(self) -> bool:
@@ -174,7 +199,7 @@ class Workspaces(Box):
         @niri_ws.setter
         def niri_ws(self, ws: NiriWorkspace):
             self.__niri_ws = ws
-            self.__on_changed()
+            self.refresh()
 
         @property
         def hypr_ws(self) -> HyprlandWorkspace | None:
@@ -183,7 +208,7 @@ class Workspaces(Box):
         @hypr_ws.setter
         def hypr_ws(self, ws: HyprlandWorkspace):
             self.__hypr_ws = ws
-            self.__on_changed()
+            self.refresh()
 
         def __set_ws_active(self, active: bool):
             if active:
@@ -191,7 +216,7 @@ class Workspaces(Box):
             else:
                 self.add_css_class("dimmed")
 
-        def __on_changed(self, *_):
+        def refresh(self):
             if self.__niri_ws:
                 self.set_tooltip_text(f"Workspace {self.__niri_ws.name or self.__niri_ws.idx}")
                 self.__set_ws_active(self.is_active)
@@ -215,11 +240,15 @@ class Workspaces(Box):
         self.connect("realize", self.__on_realize)
         set_on_scroll(self, self.__on_scroll)
 
+        # items are refreshed from here rather than connecting to services themselves, as they are pooled
+        handlers = disconnect_on_destroy(self)
         if self.__niri.is_available:
-            self.__niri.connect("notify::workspaces", self.__on_change)
+            handlers.append((self.__niri, self.__niri.connect("notify::workspaces", self.__on_change)))
+            handlers.append((self.__niri, self.__niri.connect("notify::active-workspace", self.__on_active_changed)))
 
         if self.__hypr.is_available:
-            self.__hypr.connect("notify::workspaces", self.__on_change)
+            handlers.append((self.__hypr, self.__hypr.connect("notify::workspaces", self.__on_change)))
+            handlers.append((self.__hypr, self.__hypr.connect("notify::active-workspace", self.__on_active_changed)))
 
     def __new_item(self, niri_ws: NiriWorkspace | None = None, hypr_ws: HyprlandWorkspace | None = None):
         item = self.__pool.acquire()
@@ -247,6 +276,11 @@ class Workspaces(Box):
                 self.__new_item(hypr_ws=ws) for ws in self.__hypr.workspaces if ws.monitor == self.__connector
             ]
 
+    def __on_active_changed(self, *_):
+        for item in self.child:
+            if isinstance(item, Workspaces.WorkspaceItem):
+                item.refresh()
+
     def __on_scroll(self, _, dx: float, dy: float):
         if self.__niri.is_available:
             niri_action(f"FocusWorkspace{"Up" if dx + dy < 0 else "Down"}")
@@ -281,19 +315,28 @@ class CpuUsagePill(CommandPill):
 
     def __init__(self):
         self._label: Gtk.Label | None = None
+        self._core: int = -1
+        self._interval: int = 1000
+        self.__subscriber: int | None = None
         super().__init__()
 
         self.__cpu = CpuLoadService.get_default()
-        self.__processors = self.__cpu.cpu_count
-        self.__cpu.connect("notify::total-time", self.__on_updated)
-
-    @gproperty(type=int)
+        # updated at its own interval, reading loads of the last sample taken at the fastest interval
+        subscriber = self.__subscriber = self.__cpu.subscribe(self._interval, self.__on_updated)
+        # only sample while the pill is shown
+        self.connect("map", lambda *_: self.__cpu.update_subscriber(subscriber, active=True))
+        self.connect("unmap", lambda *_: self.__cpu.update_subscriber(subscriber, active=False))
+        on_destroy(self, lambda: self.__cpu.unsubscribe(subscriber))
+
+    @gproperty(type=int, default=1000)
     def interval(self) -> int:
-        return self.__cpu.interval
+        return self._interval
 
     @interval.setter
     def interval(self, interval: int):
-        self.__cpu.interval = interval
+        self._interval = interval
+        if self.__subscriber is not None:
+            self.__cpu.update_subscriber(self.__subscriber, interval=interval)
 
     @gproperty(type=Gtk.Label)
     def labeler(self) -> Gtk.Label | None:
@@ -303,13 +346,95 @@ class CpuUsagePill(CommandPill):
     def labeler(self, label: Gtk.Label):
         self._label = label
 
+    @gproperty(type=int, default=-1)
+    def core(self) -> int:
+        """
+        index of a single core to show, or -1 for all cores
+        """
+        return self._core
+
+    @core.setter
+    def core(self, core: int):
+        self._core = core
+
     def __on_updated(self, *_):
-        idle, total = self.__cpu.idle_time, self.__cpu.total_time
-        # this means how many percent of computing resources of a single processor are used
-        # e.g. 234% means 2.34 processors are used; 1600% (with 16 processors) means all processors are used
-        percent = (total - idle) * 100 * self.__processors // total if total else 0
+        processors = self.__cpu.cpu_count
+        if 0 <= self.core < len(self.__cpu.core_loads):
+            percent = self.__cpu.core_loads[self.core] * 100
+            self.set_tooltip_text(f"CPU{self.core} Usage: {round(percent)}%")
+        else:
+            idle, total = self.__cpu.idle_time, self.__cpu.total_time
+            # this means how many percent of computing resources of a single processor are used
+            # e.g. 234% means 2.34 processors are used; 1600% (with 16 processors) means all processors are used
+            percent = (total - idle) * 100 * processors // total if total else 0
+            self.set_tooltip_text(f"CPU Usage: {round(percent)}% / {processors * 100}%")
         label = f"{round(percent)}"
-        self.set_tooltip_text(f"CPU Usage: {round(percent)}% / {self.__processors * 100}%")
+        if self.labeler:
+            self.labeler.set_label(label)
+        else:
+            self.set_label(label)
+
+
+class MemoryUsagePill(CommandPill):
+    __gtype_name__ = "MemoryUsagePill"
+
+    pressure_styles = ["", "warning", "error"]
+
+    def __init__(self):
+        self._label: Gtk.Label | None = None
+        self._interval: int = 1000
+        self.__subscriber: int | None = None
+        super().__init__()
+
+        self.__memory = MemoryService.get_default()
+        # updated at its own interval, reading the last sample taken at the fastest interval
+        subscriber = self.__subscriber = self.__memory.subscribe(self._interval, self.__on_updated)
+        # only sample while the pill is shown
+        self.connect("map", lambda *_: self.__memory.update_subscriber(subscriber, active=True))
+        self.connect("unmap", lambda *_: self.__memory.update_subscriber(subscriber, active=False))
+        on_destroy(self, lambda: self.__memory.unsubscribe(subscriber))
+
+    @gproperty(type=int, default=1000)
+    def interval(self) -> int:
+        return self._interval
+
+    @interval.setter
+    def interval(self, interval: int):
+        self._interval = interval
+        if self.__subscriber is not None:
+            self.__memory.update_subscriber(self.__subscriber, interval=interval)
+
+    @gproperty(type=Gtk.Label)
+    def labeler(self) -> Gtk.Label | None:
+        return self._label
+
+    @labeler.setter
+    def labeler(self, label: Gtk.Label):
+        self._label = label
+
+    def __on_updated(self, *_):
+        memory = self.__memory
+        total, available = memory.mem_total, memory.mem_available
+        percent = (total - available) * 100 // total if total else 0
+        gib = 1024**3
+
+        tooltip = f"Memory Usage: {(total - available) / gib:.1f} GiB / {total / gib:.1f} GiB"
+        if memory.swap_total:
+            swap_used = memory.swap_total - memory.swap_free
+            tooltip += f"\nSwap Usage: {swap_used / gib:.1f} GiB / {memory.swap_total / gib:.1f} GiB"
+        if memory.pressure_available:
+            pressure = ", ".join(f"{resource} {stall:.1f}%" for resource, stall in memory.pressure.items())
+            tooltip += f"\nPressure: {pressure}"
+        self.set_tooltip_text(tooltip)
+
+        level = memory.pressure_level
+        for idx, style in enumerate(self.pressure_styles):
+            if style and idx != level:
+                self.remove_css_class(style)
+        if self.pressure_styles[level]:
+            self.add_css_class(self.pressure_styles[level])
+
+        label = f"{percent}"
         if self.labeler:
             self.labeler.set_label(label)
         else:
@@ -384,19 +509,24 @@ class Tray(Gtk.FlowBox):
                 self.__menu.popup()
 
     def __init__(self):
-        self.__service = SystemTrayService.get_default()
+        self.__service = LazyService(SystemTrayService)
         super().__init__()
         self.add_css_class("hover")
         self.add_css_class("rounded")
 
         self.__pool = Pool(self.TrayItem)
-        self.__service.connect("added", self.__on_item_added)
+        self.__handlers = disconnect_on_destroy(self)
+        connect_mapped(self, self.__on_mapped)
         self.__list_store = Gio.ListStore()
         self.bind_model(self.__list_store, lambda item: item)
         self.set_selection_mode(Gtk.SelectionMode.NONE)
         self.set_min_children_per_line(100)
         self.set_max_children_per_line(100)
 
+    def __on_mapped(self):
+        service = self.__service.get()
+        self.__handlers.append((service, service.connect("added", self.__on_item_added)))
+
     def __new_item(self, tray_item: SystemTrayItem):
         item = self.__pool.acquire()
         item.tray_item = tray_item
@@ -405,9 +535,11 @@ class Tray(Gtk.FlowBox):
     def __on_item_added(self, _, tray_item: SystemTrayItem):
         item = self.__new_item(tray_item)
         self.__list_store.insert(0, item)
-        tray_item.connect("removed", self.__on_item_removed)
+        self.__handlers.append((tray_item, tray_item.connect("removed", self.__on_item_removed)))
 
     def __on_item_removed(self, tray_item: SystemTrayItem):
+        disconnect_handlers([handler for handler in self.__handlers if handler[0] is tray_item])
+        self.__handlers[:] = [handler for handler in self.__handlers if handler[0] is not tray_item]
         found, pos = self.__list_store.find_with_equal_func(tray_item, lambda i, t: i.tray_item == t)
         if found:
             item = self.__list_store.get_item(pos)
@@ -431,9 +563,13 @@ class FcitxIndicator(Box):
         )
 
         self.__fcitx = FcitxStateService.get_default()
-        self.__fcitx.kimpanel.connect("notify::enabled", self.__on_fcitx_enabled)
-        self.__fcitx.kimpanel.connect("notify::fcitx-im", self.__on_fcitx_state_changed)
-        self.__fcitx.kimpanel.connect("exec-menu", self.__on_fcitx_exec_menu)
+        kimpanel = self.__fcitx.kimpanel
+        disconnect_on_destroy(
+            self,
+            (kimpanel, kimpanel.connect("notify::enabled", self.__on_fcitx_enabled)),
+            (kimpanel, kimpanel.connect("notify::fcitx-im", self.__on_fcitx_state_changed)),
+            (kimpanel, kimpanel.connect("exec-menu", self.__on_fcitx_exec_menu)),
+        )
 
         set_on_click(self, left=self.__on_clicked, right=self.__on_right_clicked)
 
@@ -507,7 +643,7 @@ class CaffeineIndicator(Box):
             visible=False,
             child=[Icon(image="my-caffeine-on-symbolic")],
         )
-        self.__state.connect("notify::value", self.__on_changed)
+        disconnect_on_destroy(self, (self.__state, self.__state.connect("notify::value", self.__on_changed)))
         set_on_click(self, left=self.__on_clicked, right=self.__on_right_clicked)
 
     def __on_changed(self, *_):
@@ -543,7 +679,7 @@ class DndIndicator(Box):
         )
 
         if self.__options:
-            connect_option(self.__options, "dnd", self.__on_changed)
+            disconnect_on_destroy(self, connect_option(self.__options, "dnd", self.__on_changed))
             set_on_click(self, left=self.__on_clicked, right=self.__on_right_clicked)
         self.__on_changed()
 
@@ -562,19 +698,32 @@ class RecorderIndicator(Box):
     __gtype_name__ = "IgnisRecorderIndicator"
 
     def __init__(self):
-        self.__service = RecorderService.get_default()
+        self.__service = LazyService(RecorderService)
         self.__icon = Icon()
-        super().__init__(css_classes=["hover", "px-1", "rounded", "warning"], child=[self.__icon])
+        super().__init__(css_classes=["hover", "px-1", "rounded", "warning"], visible=False, child=[self.__icon])
 
-        self.__service.connect("notify::active", self.__on_status_changed)
-        self.__service.connect("notify::is-paused", self.__on_status_changed)
         set_on_click(self, left=self.__on_clicked, right=self.__on_right_clicked)
+        self.__destroyed = False
+        self.__handlers = disconnect_on_destroy(self)
+        on_destroy(self, self.__on_destroy)
+        # nothing is shown until recording starts, which goes through dbus or the control center
+        self.__service.when_started(self.__on_service_started)
+
+    def __on_destroy(self):
+        self.__destroyed = True
+
+    def __on_service_started(self, service: RecorderService):
+        if self.__destroyed:
+            return
+
+        self.__handlers.append((service, service.connect("notify::active", self.__on_status_changed)))
+        self.__handlers.append((service, service.connect("notify::is-paused", self.__on_status_changed)))
         self.__on_status_changed()
 
     def __on_status_changed(self, *_):
-        if self.__service.active:
+        if self.__service.get().active:
             self.set_visible(True)
-            if self.__service.is_paused:
+            if self.__service.get().is_paused:
                 self.set_tooltip_text("Screen Recorder Paused")
                 self.__icon.image = "media-playback-pause-symbolic"
             else:
@@ -584,20 +733,20 @@ class RecorderIndicator(Box):
             self.set_visible(False)
 
     def __on_clicked(self, *_):
-        if self.__service.active:
-            if self.__service.is_paused:
-                self.__service.continue_recording()
+        if self.__service.get().active:
+            if self.__service.get().is_paused:
+                self.__service.get().continue_recording()
             else:
-                self.__service.stop_recording()
+                self.__service.get().stop_recording()
         else:
-            asyncio.create_task(self.__service.start_recording(RecorderConfig.new_from_options()))
+            asyncio.create_task(self.__service.get().start_recording(RecorderConfig.new_from_options()))
 
     def __on_right_clicked(self, *_):
-        if self.__service.active:
-            if self.__service.is_paused:
-                self.__service.continue_recording()
+        if self.__service.get().active:
+            if self.__service.get().is_paused:
+                self.__service.get().continue_recording()
             else:
-                self.__service.pause_recording()
+                self.__service.get().pause_recording()
 
 
 class Audio(Box):
@@ -619,11 +768,13 @@ class Audio(Box):
             )
 
     def __init__(self):
-        self.__service = AudioService.get_default()
-        super().__init__(
-            css_classes=["hover", "rounded"],
-            child=[self.AudioItem(stream) for stream in [self.__service.speaker, self.__service.microphone] if stream],
-        )
+        self.__service = LazyService(AudioService)
+        super().__init__(css_classes=["hover", "rounded"])
+        connect_mapped(self, self.__on_mapped)
+
+    def __on_mapped(self):
+        service = self.__service.get()
+        self.child = [self.AudioItem(stream) for stream in [service.speaker, service.microphone] if stream]
 
 
 class Network(Box):
@@ -635,7 +786,7 @@ class Network(Box):
         def __init__(self, ethernet: Ethernet):
             self.__ethernet = ethernet
             super().__init__(css_classes=["px-1"], child=[Icon(image=ethernet.bind("icon_name"))])
-            ethernet.connect("notify::is-connected", self.__on_change)
+            disconnect_on_destroy(self, (ethernet, ethernet.connect("notify::is-connected", self.__on_change)))
             self.__on_change()
             set_on_click(self, left=self.__on_clicked, right=self.__on_clicked)
 
@@ -652,8 +803,11 @@ class Network(Box):
         def __init__(self, wifi: Wifi):
             self.__wifi = wifi
             super().__init__(css_classes=["px-1"], child=[Icon(image=wifi.bind("icon_name"))])
-            wifi.connect("notify::enabled", self.__on_change)
-            wifi.connect("notify::is-connected", self.__on_change)
+            disconnect_on_destroy(
+                self,
+                (wifi, wifi.connect("notify::enabled", self.__on_change)),
+                (wifi, wifi.connect("notify::is-connected", self.__on_change)),
+            )
             self.__on_change()
             set_on_click(
                 self, left=self.__on_clicked, right=lambda _: wm.toggle_window(WindowName.control_center.value)
@@ -668,11 +822,13 @@ class Network(Box):
             self.__wifi.enabled = not self.__wifi.enabled
 
     def __init__(self):
-        self.__service = NetworkService.get_default()
-        super().__init__(
-            css_classes=["hover", "rounded"],
-            child=[self.NetworkEthernet(self.__service.ethernet), self.NetworkWifi(self.__service.wifi)],
-        )
+        self.__service = LazyService(NetworkService)
+        super().__init__(css_classes=["hover", "rounded"])
+        connect_mapped(self, self.__on_mapped)
+
+    def __on_mapped(self):
+        service = self.__service.get()
+        self.child = [self.NetworkEthernet(service.ethernet), self.NetworkWifi(service.wifi)]
 
 
 class Mpris(Box):
@@ -757,9 +913,14 @@ class Mpris(Box):
                 asyncio.create_task(self.__player.next_async())
 
     def __init__(self):
-        self.__service = MprisService.get_default()
+        self.__service = LazyService(MprisService)
         super().__init__(vertical=True)
-        self.__service.connect("player-added", self.__on_player_added)
+        self.__handlers = disconnect_on_destroy(self)
+        connect_mapped(self, self.__on_mapped)
+
+    def __on_mapped(self):
+        service = self.__service.get()
+        self.__handlers.append((service, service.connect("player-added", self.__on_player_added)))
 
     def __on_player_added(self, _, player: MprisPlayer):
         self.append(self.MprisItem(player))
@@ -778,16 +939,21 @@ class Clock(Gtk.Box):
 
         set_on_click(self, left=self.__on_clicked, right=self.__on_right_clicked)
 
-        Poll(timeout=1000, callback=self.__on_change)
+        # ticks are aligned to minutes, and only while the clock is shown;
+        # multiples of a minute in epoch time are minute boundaries of every local time zone
+        sampler = SystemSampler.get_default()
+        subscriber = sampler.subscribe([], 60 * 1000, self.__on_change, active=False)
+        self.connect("map", lambda *_: self.__on_change() or sampler.update_subscriber(subscriber, active=True))
+        self.connect("unmap", lambda *_: sampler.update_subscriber(subscriber, active=False))
+        on_destroy(self, lambda: sampler.unsubscribe(subscriber))
+        self.__on_change()
 
-    def __on_change(self, poll: Poll):
+    def __on_change(self, *_):
         now = datetime.datetime.now()
 
         self.label.set_label(now.strftime("%H:%M"))
         self.label.set_tooltip_text(now.strftime("%Y-%m-%d"))
 
-        poll.set_timeout(60 * 1000 - math.floor(now.second * 1000 + now.microsecond / 1000))
-
     def __on_clicked(self, *_):
         now = datetime.datetime.now()
         self.calendar.set_year(now.year)
@@ -816,9 +982,12 @@ class Batteries(Gtk.Box):
             self.__battery = battery
             self.__percent: int = 0
 
-            battery.connect("removed", self.__on_removed)
-            battery.connect("notify::percent", self.__on_change)
-            battery.connect("notify::charging", self.__on_change)
+            disconnect_on_destroy(
+                self,
+                (battery, battery.connect("removed", self.__on_removed)),
+                (battery, battery.connect("notify::percent", self.__on_change)),
+                (battery, battery.connect("notify::charging", self.__on_change)),
+            )
 
             self.__on_change()
 
@@ -856,8 +1025,10 @@ class Batteries(Gtk.Box):
     box: Gtk.Box = gtk_template_child()
     popover: Gtk.PopoverMenu = gtk_template_child()
 
+    power_supply_path = "/sys/class/power_supply"
+
     def __init__(self):
-        self.__service = UPowerService.get_default()
+        self.__service = LazyService(UPowerService)
         super().__init__()
 
         self.__group = Gio.SimpleActionGroup()
@@ -873,8 +1044,35 @@ class Batteries(Gtk.Box):
             self, left=lambda _: self.popover.popup(), right=lambda _: wm.toggle_window(WindowName.control_center.value)
         )
 
-        self.__service.connect("battery_added", self.__on_battery_added)
-        self.__service.connect("notify::batteries", self.__on_change)
+        self.__handlers = disconnect_on_destroy(self)
+        connect_mapped(self, self.__on_mapped)
+
+    @classmethod
+    def has_battery(cls) -> bool:
+        """
+        whether any power supply is a battery, checked in sysfs without starting UPower
+        """
+        try:
+            names = os.listdir(cls.power_supply_path)
+        except OSError:
+            return False
+        for name in names:
+            try:
+                with open(os.path.join(cls.power_supply_path, name, "type")) as file:
+                    if file.read().strip() == "Battery":
+                        return True
+            except OSError:
+                continue
+        return False
+
+    def __on_mapped(self):
+        # desktops without batteries only get the power menu
+        if not self.has_battery():
+            return
+
+        service = self.__service.get()
+        self.__handlers.append((service, service.connect("battery_added", self.__on_battery_added)))
+        self.__handlers.append((service, service.connect("notify::batteries", self.__on_change)))
         self.__on_change()
 
     def __logout_session(self):
@@ -898,4 +1096,4 @@ class Batteries(Gtk.Box):
         self.box.append(self.Item(battery))
 
     def __on_change(self, *_):
-        self.stack.set_visible_child_name("batteries" if len(self.__service.batteries) != 0 else "no-batteries")
+        self.stack.set_visible_child_name("batteries" if len(self.__service.get().batteries) != 0 else "no-batteries")
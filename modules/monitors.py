@@ -0,0 +1,80 @@
+from typing import Callable
+from gi.repository import Gdk, Gio
+from loguru import logger
+from ignis.widgets import Window
+from ignis.window_manager import WindowManager
+from .utils import release_widget_tree
+
+
+wm = WindowManager.get_default()
+
+
+class MonitorManager:
+    """
+    builds a set of windows for each monitor, keyed by connector,
+    and only builds or destroys the set of a monitor that is plugged or unplugged;
+    widgets in these windows should release their service and option handlers by `on_destroy`
+    """
+
+    def __init__(self, factory: Callable[[int, str], list[Window]]):
+        self.__factory = factory
+        # dict[connector, (name, windows)]
+        self.__windows: dict[str, tuple[str, list[Window]]] = {}
+
+        display = Gdk.Display.get_default()
+        assert display is not None, "no default display"
+        self.__monitors: Gio.ListModel = display.get_monitors()
+        self.__monitors.connect("items-changed", self.__on_monitors_changed)
+        self.__on_monitors_changed()
+
+    @property
+    def connectors(self) -> list[str]:
+        return list(self.__windows.keys())
+
+    def __list_connectors(self) -> list[str | None]:
+        connectors: list[str | None] = []
+        for idx in range(self.__monitors.get_n_items()):
+            monitor = self.__monitors.get_item(idx)
+            connectors.append(monitor.get_connector() if isinstance(monitor, Gdk.Monitor) else None)
+        return connectors
+
+    def __free_name(self) -> str:
+        # namespaces are suffixed by monitor index at startup, keep them unique after hotplug
+        names = {name for name, _ in self.__windows.values()}
+        idx = 0
+        while str(idx) in names:
+            idx += 1
+        return str(idx)
+
+    def __on_monitors_changed(self, *_):
+        connectors = self.__list_connectors()
+
+        for connector in [c for c in self.__windows if c not in connectors]:
+            _, windows = self.__windows.pop(connector)
+            for window in windows:
+                self.__destroy_window(window)
+            logger.info(f"monitor `{connector}` removed, {len(windows)} windows destroyed")
+
+        for idx, connector in enumerate(connectors):
+            if connector is None:
+                continue
+
+            entry = self.__windows.get(connector)
+            if entry:
+                # index shifts when a monitor before it is removed
+                for window in entry[1]:
+                    if window.monitor != idx:
+                        window.monitor = idx
+            else:
+                name = self.__free_name()
+                self.__windows[connector] = (name, self.__factory(idx, name))
+                logger.info(f"monitor `{connector}` added, windows built")
+
+    def __destroy_window(self, window: Window):
+        namespace = window.namespace
+        if namespace in wm.list_window_names():
+            wm.remove_window(namespace)
+
+        # signal handlers on services keep the widgets alive, so they would never emit "destroy" by themselves
+        release_widget_tree(window)
+        window.destroy()
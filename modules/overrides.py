@@ -6,11 +6,9 @@ app_icons_mapper: dict[str, str] = {
 }
 
 app_id_mapper: dict[str, str] = {
-    # map windows by app_id/class to desktop files
-    "Chromium": "chromium",
-    "wechat": "com.tencent.WeChat",
+    # map windows by app_id/class to desktop files,
+    # only needed when `AppIndex` fails to match by desktop id, wm class, flatpak id or executable name
     "wemeetapp": "com.tencent.wemeet",
-    "QQ": "com.qq.QQ",
 }
 
 for app_id, icon_name in app_icons_mapper.items():
@@ -1,4 +1,5 @@
 import os.path
+from typing import Any
 from gi.repository import Adw, Gdk, Gio, GLib, GObject, Gtk
 from ignis.app import IgnisApp
 from ignis.widgets import RegularWindow
@@ -6,7 +7,7 @@ from ignis.options import options
 from .constants import WindowName
 from .template import gtk_template, gtk_template_callback, gtk_template_child
 from .useroptions import user_options
-from .utils import bind_option
+from .utils import bind_option, disconnect_handlers
 
 
 app = IgnisApp.get_initialized()
@@ -55,6 +56,7 @@ class Preferences(RegularWindow):
         def __init__(self):
             super().__init__()
             self.__file_chooser = Gtk.FileDialog()
+            self.__handlers: list[tuple[GObject.Object, int]] = []
 
             self.__bind_ignis_options()
             self.__bind_user_options()
@@ -63,20 +65,26 @@ class Preferences(RegularWindow):
             wallpaper_drop_target.connect("drop", self.__on_wallpaper_drop_target)
             self.wallpaper_path.add_controller(wallpaper_drop_target)
 
+        def __bind_option(self, *args: Any, **kwargs: Any):
+            self.__handlers.extend(bind_option(*args, **kwargs))
+
+        def unbind_options(self):
+            disconnect_handlers(self.__handlers)
+
         def __bind_ignis_options(self):
             if not options:
                 return
 
             if options.notifications is not None:
-                bind_option(options.notifications, "dnd", self.dnd, "active")
-                bind_option(
+                self.__bind_option(options.notifications, "dnd", self.dnd, "active")
+                self.__bind_option(
                     options.notifications,
                     "popup_timeout",
                     self.popup_timeout,
                     "value",
                     transform_from=lambda f: round(f),
                 )
-                bind_option(
+                self.__bind_option(
                     options.notifications,
                     "max_popups_count",
                     self.max_popups,
@@ -85,11 +93,13 @@ class Preferences(RegularWindow):
                 )
 
             if options.recorder is not None:
-                bind_option(options.recorder, "bitrate", self.bitrate, "value", transform_from=lambda f: round(f))
-                bind_option(options.recorder, "default_filename", self.recorder_filename, "text")
+                self.__bind_option(
+                    options.recorder, "bitrate", self.bitrate, "value", transform_from=lambda f: round(f)
+                )
+                self.__bind_option(options.recorder, "default_filename", self.recorder_filename, "text")
 
             if options.wallpaper is not None:
-                bind_option(
+                self.__bind_option(
                     options.wallpaper,
                     "wallpaper_path",
                     self.wallpaper_path,
@@ -102,44 +112,46 @@ class Preferences(RegularWindow):
                 return
 
             if user_options.applauncher:
-                bind_option(user_options.applauncher, "exclusive_focus", self.exclusive_focus, "active")
-                bind_option(user_options.applauncher, "command_format", self.command_format, "text")
-                bind_option(user_options.applauncher, "terminal_format", self.terminal_format, "text")
+                self.__bind_option(user_options.applauncher, "exclusive_focus", self.exclusive_focus, "active")
+                self.__bind_option(user_options.applauncher, "command_format", self.command_format, "text")
+                self.__bind_option(user_options.applauncher, "terminal_format", self.terminal_format, "text")
 
             if user_options.activewindow:
-                bind_option(user_options.activewindow, "on_click", self.on_active_click, "text")
-                bind_option(user_options.activewindow, "on_right_click", self.on_active_right_click, "text")
-                bind_option(user_options.activewindow, "on_middle_click", self.on_active_middle_click, "text")
-                bind_option(user_options.activewindow, "on_scroll_up", self.on_active_scroll_up, "text")
-                bind_option(user_options.activewindow, "on_scroll_down", self.on_active_scroll_down, "text")
-                bind_option(user_options.activewindow, "on_scroll_left", self.on_active_scroll_left, "text")
-                bind_option(user_options.activewindow, "on_scroll_right", self.on_active_scroll_right, "text")
+                self.__bind_option(user_options.activewindow, "on_click", self.on_active_click, "text")
+                self.__bind_option(user_options.activewindow, "on_right_click", self.on_active_right_click, "text")
+                self.__bind_option(user_options.activewindow, "on_middle_click", self.on_active_middle_click, "text")
+                self.__bind_option(user_options.activewindow, "on_scroll_up", self.on_active_scroll_up, "text")
+                self.__bind_option(user_options.activewindow, "on_scroll_down", self.on_active_scroll_down, "text")
+                self.__bind_option(user_options.activewindow, "on_scroll_left", self.on_active_scroll_left, "text")
+                self.__bind_option(user_options.activewindow, "on_scroll_right", self.on_active_scroll_right, "text")
 
             if user_options.appdock:
-                bind_option(user_options.appdock, "exclusive", self.dock_exclusive, "active")
-                bind_option(user_options.appdock, "focusable", self.dock_focusable, "active")
-                bind_option(user_options.appdock, "auto_conceal", self.dock_auto_conceal, "active")
-                bind_option(user_options.appdock, "monitor_only", self.dock_monitor_only, "active")
-                bind_option(user_options.appdock, "workspace_only", self.dock_workspace_only, "active")
-                bind_option(user_options.appdock, "conceal_delay", self.dock_conceal_delay, "value")
+                self.__bind_option(user_options.appdock, "exclusive", self.dock_exclusive, "active")
+                self.__bind_option(user_options.appdock, "focusable", self.dock_focusable, "active")
+                self.__bind_option(user_options.appdock, "auto_conceal", self.dock_auto_conceal, "active")
+                self.__bind_option(user_options.appdock, "monitor_only", self.dock_monitor_only, "active")
+                self.__bind_option(user_options.appdock, "workspace_only", self.dock_workspace_only, "active")
+                self.__bind_option(user_options.appdock, "conceal_delay", self.dock_conceal_delay, "value")
 
             if user_options.fcitx_kimpanel:
-                bind_option(user_options.fcitx_kimpanel, "enabled", self.fcitx_kimpanel_enabled, "active")
-                bind_option(user_options.fcitx_kimpanel, "show_popup_window", self.fcitx_show_popup, "active")
-                bind_option(user_options.fcitx_kimpanel, "vertical_list", self.fcitx_vertical_list, "active")
+                self.__bind_option(user_options.fcitx_kimpanel, "enabled", self.fcitx_kimpanel_enabled, "active")
+                self.__bind_option(user_options.fcitx_kimpanel, "show_popup_window", self.fcitx_show_popup, "active")
+                self.__bind_option(user_options.fcitx_kimpanel, "vertical_list", self.fcitx_vertical_list, "active")
 
             if user_options.osd:
-                bind_option(user_options.osd, "timeout", self.osd_timeout, "value")
+                self.__bind_option(user_options.osd, "timeout", self.osd_timeout, "value")
 
             if user_options.topbar:
-                bind_option(user_options.topbar, "exclusive", self.topbar_exclusive, "active")
-                bind_option(user_options.topbar, "focusable", self.topbar_focusable, "active")
+                self.__bind_option(user_options.topbar, "exclusive", self.topbar_exclusive, "active")
+                self.__bind_option(user_options.topbar, "focusable", self.topbar_focusable, "active")
 
             if user_options.wallpaper:
-                bind_option(user_options.wallpaper, "blur_radius", self.wallpaper_blur_radius, "value")
-                bind_option(user_options.wallpaper, "bottom_margin", self.wallpaper_bottom_margin, "value")
-                bind_option(user_options.wallpaper, "backdrop_blur_radius", self.backdrop_blur_radius, "value")
-                bind_option(user_options.wallpaper, "backdrop_bottom_margin", self.backdrop_bottom_margin, "value")
+                self.__bind_option(user_options.wallpaper, "blur_radius", self.wallpaper_blur_radius, "value")
+                self.__bind_option(user_options.wallpaper, "bottom_margin", self.wallpaper_bottom_margin, "value")
+                self.__bind_option(user_options.wallpaper, "backdrop_blur_radius", self.backdrop_blur_radius, "value")
+                self.__bind_option(
+                    user_options.wallpaper, "backdrop_bottom_margin", self.backdrop_bottom_margin, "value"
+                )
 
         @gtk_template_callback
         def on_wallpaper_select_clicked(self, *_):
@@ -176,3 +188,4 @@ class Preferences(RegularWindow):
         self.set_child(self.__view)
         self.set_title("Ignis Preferences")
         self.set_application(app)
+        self.connect("destroy", lambda *_: self.__view.unbind_options())
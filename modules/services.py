@@ -1,13 +1,16 @@
 import dataclasses
 import enum
+import operator
 import os
-from typing import Any
+import time
+from array import array
+from typing import Any, Callable
 from gi.repository import GLib
 from loguru import logger
 from ignis.base_service import BaseService
 from ignis.dbus import DBusProxy, DBusService
 from ignis.gobject import IgnisGObject, IgnisProperty, IgnisSignal
-from ignis.utils import load_interface_xml, Poll, thread
+from ignis.utils import load_interface_xml, thread
 from ignis.variable import Variable
 from .useroptions import user_options
 
@@ -20,32 +23,295 @@ except:
     libevdev_available = False
 
 
+class LazyService[T: BaseService]:
+    """
+    a handle that instantiates a service on first use, recording how long each service took to start
+    """
+
+    # dict[service name, milliseconds]
+    startup_costs: dict[str, float] = {}
+    # dict[service name, callbacks to run once the service is started by any handle]
+    __waiters: dict[str, list[Callable[[Any], Any]]] = {}
+
+    def __init__(self, service_type: type[T]):
+        self.__type = service_type
+        self.__service: T | None = None
+
+    @property
+    def started(self) -> bool:
+        return self.__service is not None
+
+    def get(self) -> T:
+        if self.__service is None:
+            start = time.perf_counter()
+            self.__service = self.__type.get_default()
+            cost = (time.perf_counter() - start) * 1000
+
+            name = self.__type.__name__
+            if name not in LazyService.startup_costs:
+                LazyService.startup_costs[name] = cost
+                logger.info(f"service `{name}` started in {cost:.1f} ms")
+                for callback in LazyService.__waiters.pop(name, []):
+                    callback(self.__service)
+        return self.__service
+
+    def when_started(self, callback: Callable[[T], Any]):
+        """
+        calls `callback` with the service once it is started through any handle, without starting it here
+        """
+        name = self.__type.__name__
+        if name in LazyService.startup_costs:
+            callback(self.get())
+        else:
+            LazyService.__waiters.setdefault(name, []).append(callback)
+
+    @classmethod
+    def report(cls) -> str:
+        costs = sorted(cls.startup_costs.items(), key=lambda item: -item[1])
+        return ", ".join(f"{name}: {cost:.1f} ms" for name, cost in costs) or "none"
+
+
+class SystemSampler(BaseService):
+    """
+    reads registered sources, e.g. `/proc` and `/sys` files, on a single timer,
+    each subscriber declares the sources it needs and a rate, due times are aligned to multiples of the rate,
+    so that subscribers of the same or of dividing rates are served by the same tick, and a source is read once per tick
+    """
+
+    @dataclasses.dataclass
+    class Source:
+        read: Callable[[], Any]
+        on_resume: Callable[[], Any] | None
+        # number of active subscribers
+        demand: int = 0
+
+    @dataclasses.dataclass
+    class Subscriber:
+        sources: list[str]
+        interval: int
+        callback: Callable[[dict[str, Any]], Any] | None
+        active: bool
+        # wall clock milliseconds
+        due: int = 0
+
+    def __init__(self):
+        super().__init__()
+        self.__sources: dict[str, SystemSampler.Source] = {}
+        self.__subscribers: dict[int, SystemSampler.Subscriber] = {}
+        self.__next_subscriber = 0
+        self.__timeout_id = 0
+        self.__timeout_due = 0
+
+        self.__started = time.monotonic()
+        self.reads = 0
+        self.ticks = 0
+        self.tick_time = 0.0
+        self.last_tick_time = 0.0
+
+    def register_source(self, name: str, read: Callable[[], Any], on_resume: Callable[[], Any] | None = None):
+        """
+        `on_resume` is called when the source is needed again after all its subscribers became inactive
+        """
+        self.__sources[name] = self.Source(read=read, on_resume=on_resume)
+
+    def subscribe(
+        self,
+        sources: list[str],
+        interval: int,
+        callback: Callable[[dict[str, Any]], Any] | None = None,
+        active: bool = True,
+    ) -> int:
+        """
+        `callback` receives results of `sources` every `interval` milliseconds while the subscriber is active
+        """
+        subscriber = self.__next_subscriber
+        self.__next_subscriber += 1
+        self.__subscribers[subscriber] = self.Subscriber(sources, interval, callback, False)
+        self.update_subscriber(subscriber, active=active)
+        return subscriber
+
+    def unsubscribe(self, subscriber: int):
+        if subscriber in self.__subscribers:
+            self.update_subscriber(subscriber, active=False)
+            del self.__subscribers[subscriber]
+
+    def update_subscriber(self, subscriber: int, interval: int | None = None, active: bool | None = None):
+        sub = self.__subscribers.get(subscriber)
+        if sub is None:
+            return
+
+        if interval is not None and interval > 0:
+            sub.interval = interval
+        if active is not None and active != sub.active:
+            sub.active = active
+            for name in sub.sources:
+                source = self.__sources[name]
+                source.demand += 1 if active else -1
+                if active and source.demand == 1 and source.on_resume:
+                    source.on_resume()
+
+        sub.due = self.__next_due(sub.interval)
+        self.__reschedule()
+
+    def source_interval(self, name: str) -> int:
+        """
+        the shortest interval of active subscribers of a source, 0 if there are none
+        """
+        intervals = [sub.interval for sub in self.__subscribers.values() if sub.active and name in sub.sources]
+        return min(intervals, default=0)
+
+    @staticmethod
+    def __now() -> int:
+        return time.time_ns() // 1_000_000
+
+    @classmethod
+    def __next_due(cls, interval: int) -> int:
+        return (cls.__now() // interval + 1) * interval
+
+    def __reschedule(self):
+        due = min((sub.due for sub in self.__subscribers.values() if sub.active), default=0)
+        if due == self.__timeout_due and self.__timeout_id != 0:
+            return
+
+        if self.__timeout_id != 0:
+            GLib.source_remove(self.__timeout_id)
+            self.__timeout_id = 0
+        self.__timeout_due = due
+        if due > 0:
+            self.__timeout_id = GLib.timeout_add(max(0, due - self.__now()), self.__on_tick)
+
+    def __on_tick(self) -> bool:
+        self.__timeout_id = 0
+        start = time.perf_counter()
+        now = self.__now()
+
+        for sub in self.__subscribers.values():
+            if sub.due > now + sub.interval:
+                # the wall clock stepped backwards, the timer runs on the monotonic clock and would wait for the jump
+                sub.due = self.__next_due(sub.interval)
+
+        due = [sub for sub in self.__subscribers.values() if sub.active and sub.due <= now + 1]
+        results: dict[str, Any] = {}
+        for sub in due:
+            for name in sub.sources:
+                if name not in results:
+                    # a failing source or subscriber must not stop the timer of all others
+                    try:
+                        results[name] = self.__sources[name].read()
+                    except Exception:
+                        results[name] = None
+                        logger.exception(f"failed to read sampler source `{name}`")
+                    self.reads += 1
+        for sub in due:
+            sub.due = self.__next_due(sub.interval)
+            if sub.callback:
+                try:
+                    sub.callback({name: results[name] for name in sub.sources})
+                except Exception:
+                    logger.exception("sampler subscriber callback failed")
+
+        self.ticks += 1
+        self.last_tick_time = (time.perf_counter() - start) * 1000
+        self.tick_time += self.last_tick_time
+        self.__timeout_due = 0
+        self.__reschedule()
+        return GLib.SOURCE_REMOVE
+
+    def stats(self) -> dict[str, Any]:
+        elapsed = time.monotonic() - self.__started
+        return {
+            "sources": {name: source.demand for name, source in self.__sources.items()},
+            "subscribers": sum(1 for sub in self.__subscribers.values() if sub.active),
+            "reads_per_second": self.reads / elapsed if elapsed > 0 else 0.0,
+            "ticks": self.ticks,
+            "avg_tick_ms": self.tick_time / self.ticks if self.ticks else 0.0,
+            "last_tick_ms": self.last_tick_time,
+        }
+
+
 class CpuLoadService(BaseService):
+    """
+    samples aggregate and per-core cpu load as source "cpu" of `SystemSampler`,
+    and keeps the loads of the last `history_size` samples in a ring buffer
+    """
+
+    history_size = 60
+
     def __init__(self):
         super().__init__()
-        self._cpu_count = self.__read_cpu_count()
+        self.__stat_fd = os.open("/proc/stat", os.O_RDONLY | os.O_CLOEXEC)
+        self.__stat_buffer = bytearray(4096)
         self._idle_time: int = 0
         self._total_time: int = 0
-        self.__cpu_times = self.__read_cpu_times()
-        self.__poll = Poll(timeout=1000, callback=self.__update_times)
+        self.__cpu_times, cores, self.__core_idles, self.__core_totals = self.__read_cpu_times()
+        self.__allocate(cores, len(self.__core_totals))
 
-    @classmethod
-    def __read_cpu_count(cls) -> int:
-        with open("/proc/cpuinfo") as cpuinfo:
-            count = 0
-            for line in cpuinfo.readlines():
-                if line.startswith("processor"):
-                    count += 1
-            return count
+        self.__sampler = SystemSampler.get_default()
+        self.__sampler.register_source("cpu", self.__update_times, on_resume=self.__on_resume)
+        self.__interval = 0
 
-    @classmethod
-    def __read_cpu_times(cls) -> list[int]:
-        with open("/proc/stat") as stat:
-            line = stat.readline().split()[1:]
-            return list(map(int, line[: min(7, len(line))]))
+    def __allocate(self, cores: tuple[int, ...], slots: int):
+        """
+        per-core slots are indexed by `N` of "cpuN", offline cores keep zero loads
+        """
+        self.__cores = cores
+        self._cpu_count = len(cores) or self.__online_count()
+        self.__core_loads = array("d", bytes(8 * slots))
+        # row 0 for the aggregate load, row `n + 1` for core `n`, each row is a ring of `history_size` samples
+        self.__history = array("d", bytes(8 * self.history_size * (slots + 1)))
+        self.__history_head = 0
+
+    @staticmethod
+    def __online_count() -> int:
+        return len(os.sched_getaffinity(0)) or os.cpu_count() or 1
+
+    def __read_stat(self) -> int:
+        """
+        reads `/proc/stat` into the buffer, which grows until the whole file fits in
+        """
+        while True:
+            size = os.preadv(self.__stat_fd, [self.__stat_buffer], 0)
+            if size < len(self.__stat_buffer):
+                return size
+            self.__stat_buffer = bytearray(len(self.__stat_buffer) * 2)
+
+    def __read_cpu_times(self) -> tuple[list[int], tuple[int, ...], array, array]:
+        """
+        aggregate cpu times, indices of online cores, and idle and total times of each core slot
+        """
+        size = self.__read_stat()
+        buffer = self.__stat_buffer
+
+        # "cpu  user nice system idle iowait irq softirq ..."
+        end = buffer.find(b"\n", 0, size)
+        times = list(map(int, buffer[:end].split()[1:8]))
+
+        # "cpuN ..." lines follow, parsing stops at the first other line, e.g. the long "intr" line
+        cores: list[int] = []
+        core_times: list[list[int]] = []
+        start = end + 1
+        while buffer.startswith(b"cpu", start, size):
+            end = buffer.find(b"\n", start, size)
+            if end == -1:
+                break
+            fields = buffer[start:end].split()
+            cores.append(int(fields[0][3:]))
+            core_times.append(list(map(int, fields[1:8])))
+            start = end + 1
+
+        # offline cores have no line, so slots are indexed by N rather than by position
+        slots = max(cores) + 1 if cores else self.__online_count()
+        idles, totals = array("q", bytes(8 * slots)), array("q", bytes(8 * slots))
+        for core, values in zip(cores, core_times):
+            idles[core] = values[3]
+            totals[core] = sum(values)
+        return times, tuple(cores), idles, totals
 
     @IgnisProperty
     def cpu_count(self) -> int:
+        """
+        number of online cores
+        """
         return self._cpu_count
 
     @IgnisProperty
@@ -62,29 +328,220 @@ class CpuLoadService(BaseService):
         """
         return self._total_time
 
+    @IgnisProperty
+    def core_loads(self) -> memoryview:
+        """
+        load of each core during last polling interval, from 0 to 1, indexed by `N` of "cpuN"
+        """
+        return memoryview(self.__core_loads).toreadonly()
+
+    @IgnisProperty
+    def history(self) -> memoryview:
+        """
+        ring buffer of loads, `history_size` samples of the aggregate load followed by those of each core,
+        the oldest sample of each row is at `history_head`
+        """
+        return memoryview(self.__history).toreadonly()
+
+    @IgnisProperty
+    def history_head(self) -> int:
+        return self.__history_head
+
+    def history_row(self, core: int | None = None) -> memoryview:
+        """
+        ring buffer of the aggregate load, or of a single core
+        """
+        row = 0 if core is None else core + 1
+        return self.history[row * self.history_size : (row + 1) * self.history_size]
+
     @IgnisProperty
     def interval(self) -> int:
         """
-        sample interval in milliseconds
+        sample interval in milliseconds, 0 when sampling is stopped
         """
-        return self.__poll.timeout
+        return self.__sampler.source_interval("cpu")
 
-    @interval.setter
-    def interval(self, ms: int):
-        self.__poll.timeout = ms
+    def subscribe(
+        self, interval: int = 1000, callback: Callable[[dict[str, Any]], Any] | None = None, active: bool = False
+    ) -> int:
+        """
+        registers a subscriber requesting samples every `interval` milliseconds while it is active,
+        `callback` is called at the subscriber's own interval, while the properties update at the fastest one
+        """
+        subscriber = self.__sampler.subscribe(["cpu"], interval, callback, active=active)
+        self.__notify_interval()
+        return subscriber
+
+    def unsubscribe(self, subscriber: int):
+        self.__sampler.unsubscribe(subscriber)
+        self.__notify_interval()
+
+    def update_subscriber(self, subscriber: int, interval: int | None = None, active: bool | None = None):
+        self.__sampler.update_subscriber(subscriber, interval, active)
+        self.__notify_interval()
+
+    def __notify_interval(self):
+        interval = self.__sampler.source_interval("cpu")
+        if interval != self.__interval:
+            self.__interval = interval
+            self.notify("interval")
+
+    def __on_resume(self):
+        # the next sample should not cover the stopped period
+        self.__cpu_times, _, self.__core_idles, self.__core_totals = self.__read_cpu_times()
 
     def __update_times(self, *_):
         """
-        updates (idle, total) since last called
+        updates (idle, total) and per-core loads since last called
         """
-        times = self.__read_cpu_times()
+        times, cores, idles, totals = self.__read_cpu_times()
+        if cores != self.__cores:
+            # cpu hotplug, per-core history starts over
+            self.__allocate(cores, len(totals))
+            self.__core_idles, self.__core_totals = idles, totals
+            self.notify("cpu_count")
+            self.notify("history")
+
         deltas = [times[i] - self.__cpu_times[i] for i in range(len(times))]
         self._total_time = sum(deltas)
-        self.notify("total_time")
         self._idle_time = deltas[3]
-        self.notify("idle_time")
         self.__cpu_times = times
 
+        total_deltas = array("q", map(operator.sub, totals, self.__core_totals))
+        idle_deltas = array("q", map(operator.sub, idles, self.__core_idles))
+        self.__core_loads[:] = array("d", map(cpu_load, total_deltas, idle_deltas))
+        self.__core_idles, self.__core_totals = idles, totals
+
+        head, size = self.__history_head, self.history_size
+        self.__history[head] = cpu_load(self._total_time, self._idle_time)
+        self.__history[size + head :: size] = self.__core_loads
+        self.__history_head = (head + 1) % size
+
+        self.notify("core_loads")
+        self.notify("history_head")
+        self.notify("total_time")
+        self.notify("idle_time")
+
+
+def cpu_load(total: int, idle: int) -> float:
+    return (total - idle) / total if total > 0 else 0.0
+
+
+class MemoryService(BaseService):
+    """
+    samples `/proc/meminfo` and pressure stall information of cpu, memory and io,
+    as source "memory" of `SystemSampler`
+    """
+
+    meminfo_keys = {
+        b"MemTotal": "mem_total",
+        b"MemAvailable": "mem_available",
+        b"SwapTotal": "swap_total",
+        b"SwapFree": "swap_free",
+    }
+    pressure_resources = ["cpu", "memory", "io"]
+    # "some avg10" percentages at which pressure is considered warning and critical
+    pressure_thresholds = (10.0, 40.0)
+
+    def __init__(self):
+        super().__init__()
+        self.__buffer = bytearray(8192)
+        self.__meminfo_fd = os.open("/proc/meminfo", os.O_RDONLY | os.O_CLOEXEC)
+        self.__pressure_fds: dict[str, int] = {}
+        for resource in self.pressure_resources:
+            try:
+                self.__pressure_fds[resource] = os.open(f"/proc/pressure/{resource}", os.O_RDONLY | os.O_CLOEXEC)
+            except OSError:
+                # kernel without psi, or booted with psi=0
+                pass
+
+        self.__meminfo: dict[str, int] = {name: 0 for name in self.meminfo_keys.values()}
+        self.__pressure: dict[str, float] = {resource: 0.0 for resource in self.pressure_resources}
+
+        self.__sampler = SystemSampler.get_default()
+        self.__sampler.register_source("memory", self.__update)
+        self.__update()
+
+    def __read(self, fd: int) -> memoryview:
+        size = os.preadv(fd, [self.__buffer], 0)
+        return memoryview(self.__buffer)[:size]
+
+    def __read_meminfo(self):
+        # "MemTotal:       16324556 kB"
+        for line in self.__read(self.__meminfo_fd).tobytes().splitlines():
+            key, _, value = line.partition(b":")
+            name = self.meminfo_keys.get(key)
+            if name:
+                self.__meminfo[name] = int(value.split()[0]) * 1024
+
+    def __read_pressure(self, fd: int) -> float:
+        # "some avg10=0.00 avg60=0.00 avg300=0.00 total=0"
+        line = self.__read(fd).tobytes().partition(b"\n")[0]
+        return float(line.split()[1].partition(b"=")[2])
+
+    def __update(self, *_):
+        meminfo, pressure, level = dict(self.__meminfo), dict(self.__pressure), self.pressure_level
+        self.__read_meminfo()
+        for resource, fd in self.__pressure_fds.items():
+            self.__pressure[resource] = self.__read_pressure(fd)
+
+        for name, value in meminfo.items():
+            if self.__meminfo[name] != value:
+                self.notify(name)
+        if self.__pressure != pressure:
+            self.notify("pressure")
+        if self.pressure_level != level:
+            self.notify("pressure_level")
+
+    @IgnisProperty
+    def mem_total(self) -> int:
+        return self.__meminfo["mem_total"]
+
+    @IgnisProperty
+    def mem_available(self) -> int:
+        return self.__meminfo["mem_available"]
+
+    @IgnisProperty
+    def swap_total(self) -> int:
+        return self.__meminfo["swap_total"]
+
+    @IgnisProperty
+    def swap_free(self) -> int:
+        return self.__meminfo["swap_free"]
+
+    @IgnisProperty
+    def pressure_available(self) -> bool:
+        return len(self.__pressure_fds) > 0
+
+    @IgnisProperty
+    def pressure(self) -> dict[str, float]:
+        """
+        "some avg10" stall percentages by resource
+        """
+        return self.__pressure
+
+    @IgnisProperty
+    def pressure_level(self) -> int:
+        """
+        0 for normal, 1 for warning, 2 for critical, by the most stalled resource
+        """
+        stall = max(self.__pressure.values(), default=0.0)
+        return sum(1 for threshold in self.pressure_thresholds if stall >= threshold)
+
+    def subscribe(
+        self, interval: int = 1000, callback: Callable[[dict[str, Any]], Any] | None = None, active: bool = False
+    ) -> int:
+        """
+        `callback` is called at the subscriber's own interval, while the properties update at the fastest one
+        """
+        return self.__sampler.subscribe(["memory"], interval, callback, active=active)
+
+    def unsubscribe(self, subscriber: int):
+        self.__sampler.unsubscribe(subscriber)
+
+    def update_subscriber(self, subscriber: int, interval: int | None = None, active: bool | None = None):
+        self.__sampler.update_subscriber(subscriber, interval, active)
+
 
 class FcitxStateService(BaseService):
     current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -1,53 +1,398 @@
-import os, subprocess
+import hashlib, json, os, shutil, subprocess
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Callable
-from gi.repository import Gtk
+from gi.repository import Gio, GLib, Gtk
+from loguru import logger
 from ignis import CACHE_DIR
+from .tracer import tracer
 
 
 config_dir = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
 blp_ui_path = os.path.join(config_dir, "ui")
 cache_ui_path = os.path.join(CACHE_DIR, "ui")
+blueprint_compiler = "blueprint-compiler"
+resource_prefix = "/io/github/lost_melody/IgnisNiriShell"
+resource_bundle_path = os.path.join(CACHE_DIR, "ignis-shell.gresource")
+
+
+class BlueprintCache:
+    """
+    manifest of compiled blueprints, keyed by blueprint content hash and compiler version
+    """
+
+    def __init__(self, cache_dir: str):
+        self.__manifest_file = os.path.join(cache_dir, "manifest.json")
+        # compiler: {path, mtime, size, version}
+        self.__compiler: dict[str, Any] = {}
+        # dict[filename, {hash, mtime, size, compiler}]
+        self.__entries: dict[str, dict[str, Any]] = {}
+        self.__compiler_version: str | None = None
+        # templates already looked up in this process
+        self.__checked: set[str] = set()
+        # changes not written to the manifest yet
+        self.__dirty = False
+        self.hits: int = 0
+        self.misses: int = 0
+        self.__load()
+
+    def __load(self):
+        try:
+            with open(self.__manifest_file) as file:
+                manifest = json.load(file)
+            self.__compiler = manifest.get("compiler", {})
+            self.__entries = manifest.get("entries", {})
+        except (OSError, ValueError, AttributeError):
+            self.__compiler, self.__entries = {}, {}
+
+    def __save(self):
+        os.makedirs(os.path.dirname(self.__manifest_file), exist_ok=True)
+        tmp_file = self.__manifest_file + ".tmp"
+        with open(tmp_file, "w") as file:
+            json.dump({"compiler": self.__compiler, "entries": self.__entries}, file)
+        os.replace(tmp_file, self.__manifest_file)
+
+    def flush(self):
+        """
+        writes the manifest once for all changes since the last flush
+        """
+        if self.__dirty:
+            self.__dirty = False
+            self.__save()
+
+    @property
+    def compiler_version(self) -> str:
+        """
+        blueprint-compiler version, looked up once per process,
+        and only queried again when the compiler binary changes
+        """
+        if self.__compiler_version is not None:
+            return self.__compiler_version
+
+        path = shutil.which(blueprint_compiler) or ""
+        try:
+            stat = os.stat(path)
+            mtime, size = stat.st_mtime_ns, stat.st_size
+        except OSError:
+            mtime, size = 0, 0
+
+        compiler = self.__compiler
+        if compiler.get("path") == path and compiler.get("mtime") == mtime and compiler.get("size") == size:
+            self.__compiler_version = str(compiler.get("version", ""))
+        else:
+            version = ""
+            if path:
+                result = subprocess.run(args=[path, "--version"], capture_output=True, text=True)
+                version = result.stdout.strip()
+            self.__compiler = {"path": path, "mtime": mtime, "size": size, "version": version}
+            self.__compiler_version = version
+            self.__dirty = True
+
+        return self.__compiler_version
+
+    @classmethod
+    def hash_file(cls, filename: str) -> str:
+        with open(filename, "rb") as file:
+            return hashlib.sha256(file.read()).hexdigest()
+
+    def is_fresh(self, filename: str, blp_filename: str, ui_filename: str, stat: os.stat_result) -> bool:
+        """
+        whether `ui_filename` is compiled from the current content of `blp_filename`
+        """
+        entry = self.__entries.get(filename)
+        if not entry or entry.get("compiler") != self.compiler_version or not os.path.exists(ui_filename):
+            return False
+
+        if entry.get("mtime") == stat.st_mtime_ns and entry.get("size") == stat.st_size:
+            return True
+
+        # touched but maybe not modified, e.g. git checkout
+        if entry.get("hash") == self.hash_file(blp_filename):
+            entry["mtime"], entry["size"] = stat.st_mtime_ns, stat.st_size
+            self.__dirty = True
+            return True
+
+        return False
+
+    def is_unchanged(self, filename: str, blp_filename: str, stat: os.stat_result) -> bool:
+        """
+        whether `blp_filename` still has the content recorded in the manifest, without looking at compiled files
+        """
+        entry = self.__entries.get(filename)
+        if not entry:
+            return False
+        if entry.get("mtime") == stat.st_mtime_ns and entry.get("size") == stat.st_size:
+            return True
+        return entry.get("hash") == self.hash_file(blp_filename)
+
+    def update(self, filename: str, blp_filename: str, stat: os.stat_result):
+        self.__entries[filename] = {
+            "hash": self.hash_file(blp_filename),
+            "mtime": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "compiler": self.compiler_version,
+        }
+        self.__checked.add(filename)
+        self.__dirty = True
+
+    def lookup(self, filename: str, blp_filename: str, ui_filename: str, stat: os.stat_result) -> bool:
+        """
+        checks the manifest and updates hit/miss counters
+        """
+        if filename in self.__checked:
+            return True
+
+        if self.is_fresh(filename, blp_filename, ui_filename, stat):
+            self.__checked.add(filename)
+            self.hits += 1
+            return True
+        else:
+            self.misses += 1
+            return False
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+    def templates(self) -> list[str]:
+        return sorted(self.__entries.keys())
+
+    def digest(self) -> str:
+        """
+        digest of all manifest entries, without touching any blueprint file
+        """
+        entries = {filename: [entry.get("hash"), entry.get("compiler")] for filename, entry in self.__entries.items()}
+        return hashlib.sha256(json.dumps(entries, sort_keys=True).encode()).hexdigest()
+
+
+blueprint_cache = BlueprintCache(cache_ui_path)
+
+
+def scss_digest() -> str:
+    """
+    digest of `.scss` sources in `config_dir`, by file stats
+    """
+    stats = []
+    for file in sorted(os.listdir(config_dir)):
+        if file.endswith(".scss"):
+            stat = os.stat(os.path.join(config_dir, file))
+            stats.append([file, stat.st_mtime_ns, stat.st_size])
+    return hashlib.sha256(json.dumps(stats).encode()).hexdigest()
+
+
+class ResourceBundle:
+    """
+    compiled templates and css packed into a single `.gresource` file, registered once and memory-mapped,
+    bundled blueprints are checked against their sources only with environment variable `IGNIS_SHELL_DEV=1`
+    """
+
+    ENV_NAME = "IGNIS_SHELL_DEV"
+
+    def __init__(self, filename: str):
+        self.__filename = filename
+        self.__check_blueprints = os.environ.get(self.ENV_NAME, "") not in ("", "0")
+        self.__stamp_file = filename + ".json"
+        self.__templates: set[str] = set()
+        self.__css: set[str] = set()
+        self.__loaded = False
+
+    @property
+    def loaded(self) -> bool:
+        return self.__loaded
+
+    def load(self) -> bool:
+        """
+        registers the bundle if it is built from the current blueprints and scss sources
+        """
+        if self.__loaded:
+            return True
+
+        try:
+            with open(self.__stamp_file) as file:
+                stamp = json.load(file)
+            if stamp.get("templates_digest") != blueprint_cache.digest():
+                return False
+            if stamp.get("scss_digest") != scss_digest():
+                return False
+            if self.__check_blueprints and not self.__blueprints_unchanged(stamp.get("templates", [])):
+                return False
+            resource = Gio.Resource.load(self.__filename)
+        except (OSError, ValueError, AttributeError, GLib.Error) as e:
+            if not isinstance(e, FileNotFoundError):
+                logger.warning(f"failed to load resource bundle: {e}")
+            return False
+
+        Gio.resources_register(resource)
+        self.__templates = set(stamp.get("templates", []))
+        self.__css = set(stamp.get("css", []))
+        self.__loaded = True
+        return True
+
+    def __blueprints_unchanged(self, templates: list[str]) -> bool:
+        """
+        whether bundled templates are compiled from the current blueprints, one stat per blueprint
+        """
+        for filename in templates:
+            blp_filename = os.path.join(blp_ui_path, filename + ".blp")
+            try:
+                stat = os.stat(blp_filename)
+            except FileNotFoundError:
+                continue
+            if not blueprint_cache.is_unchanged(filename, blp_filename, stat):
+                logger.info(f"blueprint `{filename}` changed since the resource bundle was built")
+                return False
+        return True
+
+    def has_template(self, filename: str) -> bool:
+        return filename in self.__templates
+
+    def template_path(self, filename: str) -> str:
+        return f"{resource_prefix}/ui/{filename}.ui"
+
+    def lookup_css(self, name: str) -> str | None:
+        if name not in self.__css:
+            return None
+
+        data = Gio.resources_lookup_data(f"{resource_prefix}/css/{name}.css", Gio.ResourceLookupFlags.NONE)
+        return (data.get_data() or b"").decode()
+
+    def build(self, css: dict[str, str]):
+        """
+        packs all compiled templates and the given compiled css into the bundle
+        """
+        prebuild_blueprints()
+
+        templates = [t for t in blueprint_cache.templates() if os.path.exists(os.path.join(cache_ui_path, t + ".ui"))]
+        css_path = os.path.join(CACHE_DIR, "css")
+        os.makedirs(css_path, exist_ok=True)
+        for name, content in css.items():
+            with open(os.path.join(css_path, name + ".css"), "w") as file:
+                file.write(content)
+
+        files = [f"ui/{t}.ui" for t in templates] + [f"css/{name}.css" for name in css]
+        xml_filename = self.__filename + ".xml"
+        with open(xml_filename, "w") as file:
+            file.write('<?xml version="1.0" encoding="UTF-8"?>\n<gresources>\n')
+            file.write(f'  <gresource prefix="{resource_prefix}">\n')
+            for f in files:
+                file.write(f"    <file>{f}</file>\n")
+            file.write("  </gresource>\n</gresources>\n")
+
+        result = subprocess.run(
+            args=["glib-compile-resources", "--sourcedir", CACHE_DIR, "--target", self.__filename, xml_filename]
+        )
+        if result.returncode != 0:
+            raise Exception(f"glib-compile-resources exits with return code {result.returncode}")
+
+        stamp = {
+            "templates_digest": blueprint_cache.digest(),
+            "scss_digest": scss_digest(),
+            "templates": templates,
+            "css": list(css.keys()),
+        }
+        with open(self.__stamp_file + ".tmp", "w") as file:
+            json.dump(stamp, file)
+        os.replace(self.__stamp_file + ".tmp", self.__stamp_file)
+        logger.info(f"resource bundle built with {len(templates)} templates: {self.__filename}")
+
+
+resource_bundle = ResourceBundle(resource_bundle_path)
 
 
 def build_blueprint(blp_filename: str, ui_filename: str):
     os.makedirs(os.path.dirname(ui_filename), exist_ok=True)
 
-    result = subprocess.run(args=["blueprint-compiler", "compile", "--out", ui_filename, blp_filename])
+    result = subprocess.run(args=[blueprint_compiler, "compile", "--out", ui_filename, blp_filename])
 
     if result.returncode != 0:
         raise Exception(f"blueprint-compiler exits with return code {result.returncode}")
 
 
+def batch_build_blueprints(filenames: list[str]):
+    """
+    compiles blueprints relative to `blp_ui_path` in a single `blueprint-compiler` process
+    """
+    if not filenames:
+        return
+
+    for dirname in {os.path.dirname(os.path.join(cache_ui_path, filename)) for filename in filenames}:
+        os.makedirs(dirname, exist_ok=True)
+    blp_filenames = [os.path.join(blp_ui_path, filename + ".blp") for filename in filenames]
+    result = subprocess.run(args=[blueprint_compiler, "batch-compile", cache_ui_path, blp_ui_path, *blp_filenames])
+
+    if result.returncode != 0:
+        # fall back to separate processes, so that only broken blueprints are left stale
+        logger.warning(f"blueprint-compiler batch-compile exits with return code {result.returncode}")
+
+        def build(filename: str):
+            blp_filename = os.path.join(blp_ui_path, filename + ".blp")
+            build_blueprint(blp_filename, os.path.join(cache_ui_path, filename + ".ui"))
+
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 4) as executor:
+            for filename, future in [(f, executor.submit(build, f)) for f in filenames]:
+                try:
+                    future.result()
+                except Exception as e:
+                    filenames = [f for f in filenames if f != filename]
+                    logger.warning(f"failed to build blueprint `{filename}`: {e}")
+
+    for filename in filenames:
+        blp_filename = os.path.join(blp_ui_path, filename + ".blp")
+        blueprint_cache.update(filename, blp_filename, os.stat(blp_filename))
+
+
+def prebuild_blueprints():
+    """
+    builds all stale blueprints under `blp_ui_path` at once, before any `gtk_template` is declared
+    """
+    stale: list[str] = []
+    for dirpath, _, files in os.walk(blp_ui_path):
+        for file in files:
+            if not file.endswith(".blp"):
+                continue
+
+            blp_filename = os.path.join(dirpath, file)
+            filename = os.path.relpath(blp_filename, blp_ui_path)[:-4]
+            ui_filename = os.path.join(cache_ui_path, filename + ".ui")
+            if not blueprint_cache.lookup(filename, blp_filename, ui_filename, os.stat(blp_filename)):
+                stale.append(filename)
+
+    if stale:
+        logger.info(f"building {len(stale)} blueprints")
+        with tracer.span("batch build blueprints", "template", count=len(stale)):
+            batch_build_blueprints(stale)
+    blueprint_cache.flush()
+
+
 def ensure_ui_file(filename: str) -> str:
     blp_filename = os.path.join(blp_ui_path, filename + ".blp")
     ui_filename = os.path.join(cache_ui_path, filename + ".ui")
 
-    blp_exist = os.path.exists(blp_filename)
-    ui_exist = os.path.exists(ui_filename)
+    try:
+        stat = os.stat(blp_filename)
+    except FileNotFoundError:
+        if os.path.exists(ui_filename):
+            return ui_filename
+        raise Exception(f"blueprint file `{blp_filename}` does not exist")
 
-    if blp_exist:
-        if ui_exist:
-            blp_mtime = os.path.getmtime(blp_filename)
-            ui_mtime = os.path.getmtime(ui_filename)
-
-            if ui_mtime < blp_mtime:
-                build_blueprint(blp_filename, ui_filename)
-        else:
+    if not blueprint_cache.lookup(filename, blp_filename, ui_filename, stat):
+        logger.info(f"building blueprint `{filename}`")
+        with tracer.span(f"build blueprint {filename}", "template"):
             build_blueprint(blp_filename, ui_filename)
-    else:
-        if ui_exist:
-            pass
-        else:
-            raise Exception(f"blueprint file `{blp_filename}` does not exist")
+        blueprint_cache.update(filename, blp_filename, stat)
+    blueprint_cache.flush()
 
     return ui_filename
 
 
 def gtk_template[Widget: type[Gtk.Widget]](filename: str) -> Callable[[Widget], Widget]:
-    template = Gtk.Template(filename=ensure_ui_file(filename))
+    with tracer.span(f"template {filename}", "template"):
+        if resource_bundle.has_template(filename):
+            template = Gtk.Template(resource_path=resource_bundle.template_path(filename))
+        else:
+            template = Gtk.Template(filename=ensure_ui_file(filename))
 
     def decorator(cls: Widget) -> Widget:
-        return template(cls)  # type: ignore
+        with tracer.span(f"template class {cls.__name__}", "template"):
+            return template(cls)  # type: ignore
 
     return decorator
 
@@ -3,7 +3,7 @@ from ignis.widgets import Window
 from .constants import WindowName
 from .template import gtk_template
 from .useroptions import user_options
-from .utils import connect_option
+from .utils import connect_option, disconnect_on_destroy
 
 
 class Topbar(Window):
@@ -13,10 +13,10 @@ class Topbar(Window):
     class View(Gtk.CenterBox):
         __gtype_name__ = "TopbarView"
 
-    def __init__(self, monitor: int = 0):
+    def __init__(self, monitor: int = 0, name: str | None = None):
         self.__options = user_options and user_options.topbar
         super().__init__(
-            namespace=f"{WindowName.top_bar.value}-{monitor}",
+            namespace=f"{WindowName.top_bar.value}-{monitor if name is None else name}",
             monitor=monitor,
             anchor=["top", "left", "right"],
             css_classes=["topbar"],
@@ -26,8 +26,11 @@ class Topbar(Window):
         self.set_child(self.__view)
 
         if self.__options:
-            connect_option(self.__options, "exclusive", self.__on_exclusive_changed)
-            connect_option(self.__options, "focusable", self.__on_focusable_changed)
+            disconnect_on_destroy(
+                self,
+                connect_option(self.__options, "exclusive", self.__on_exclusive_changed),
+                connect_option(self.__options, "focusable", self.__on_focusable_changed),
+            )
             self.__on_exclusive_changed()
 
     def __on_exclusive_changed(self, *_):
@@ -0,0 +1,119 @@
+import json, os, sys, threading, time
+from contextlib import contextmanager
+from importlib.abc import MetaPathFinder
+from importlib.machinery import ModuleSpec
+from typing import Any, Iterator
+from ignis import CACHE_DIR
+
+
+class StartupTracer:
+    """
+    records nested spans during startup and writes them as a chrome trace,
+    enabled by setting environment variable `IGNIS_SHELL_TRACE=1`
+    """
+
+    ENV_NAME = "IGNIS_SHELL_TRACE"
+
+    class ImportFinder(MetaPathFinder):
+        """
+        wraps loaders found by other finders, so that module executions are recorded as spans
+        """
+
+        class Loader:
+            def __init__(self, tracer: "StartupTracer", loader: Any):
+                self.__tracer = tracer
+                self.__loader = loader
+
+            def __getattr__(self, name: str) -> Any:
+                return getattr(self.__loader, name)
+
+            def create_module(self, spec: ModuleSpec):
+                return self.__loader.create_module(spec)
+
+            def exec_module(self, module: Any):
+                with self.__tracer.span(f"import {module.__name__}", "import"):
+                    self.__loader.exec_module(module)
+
+        def __init__(self, tracer: "StartupTracer"):
+            self.__tracer = tracer
+            self.__finding = threading.local()
+
+        def find_spec(self, fullname: str, path: Any, target: Any = None) -> ModuleSpec | None:
+            if getattr(self.__finding, "active", False):
+                return None
+
+            self.__finding.active = True
+            try:
+                for finder in sys.meta_path:
+                    if finder is self or not hasattr(finder, "find_spec"):
+                        continue
+                    spec = finder.find_spec(fullname, path, target)
+                    if spec is None:
+                        continue
+                    if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                        spec.loader = self.Loader(self.__tracer, spec.loader)
+                    return spec
+                return None
+            finally:
+                self.__finding.active = False
+
+    def __init__(self, filename: str):
+        self.__filename = filename
+        self.__enabled = os.environ.get(self.ENV_NAME, "") not in ("", "0")
+        self.__origin = time.perf_counter_ns()
+        self.__events: list[dict[str, Any]] = []
+        self.__finished = False
+
+        if self.__enabled:
+            sys.meta_path.insert(0, self.ImportFinder(self))
+
+    @property
+    def enabled(self) -> bool:
+        return self.__enabled
+
+    @contextmanager
+    def span(self, name: str, category: str = "startup", **args: Any) -> Iterator[None]:
+        if not self.__enabled:
+            yield
+            return
+
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            end = time.perf_counter_ns()
+            self.__events.append(
+                {
+                    "name": name,
+                    "cat": category,
+                    "ph": "X",
+                    "ts": (start - self.__origin) / 1000,
+                    "dur": (end - start) / 1000,
+                    "pid": os.getpid(),
+                    "tid": threading.get_ident(),
+                    "args": args,
+                }
+            )
+            # spans after startup, e.g. lazy windows, are appended to the written trace
+            if self.__finished and category != "import":
+                self.dump()
+
+    def finish(self):
+        """
+        stops tracing imports and writes the trace
+        """
+        if not self.__enabled:
+            return
+
+        sys.meta_path[:] = [f for f in sys.meta_path if not isinstance(f, self.ImportFinder)]
+        self.__finished = True
+        self.dump()
+
+    def dump(self):
+        os.makedirs(os.path.dirname(self.__filename), exist_ok=True)
+        with open(self.__filename + ".tmp", "w") as file:
+            json.dump({"traceEvents": self.__events, "displayTimeUnit": "ms"}, file)
+        os.replace(self.__filename + ".tmp", self.__filename)
+
+
+tracer = StartupTracer(os.path.join(CACHE_DIR, "startup-trace.json"))
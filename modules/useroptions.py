@@ -1,14 +1,72 @@
+import atexit, json, os
+from gi.repository import GLib
+from loguru import logger
 from ignis import DATA_DIR
 from ignis.options_manager import OptionsGroup, OptionsManager
 
 
 class UserOptions(OptionsManager):
+    """
+    options are written behind changes: batched within a write delay,
+    skipped when the content is unchanged, written atomically, and flushed on exit
+    """
+
+    __write_delay = 500
+
     def __init__(self):
+        self.__pending_file: str | None = None
+        self.__write_id = 0
+        self.__written: dict[str, str] = {}
+        self.__writes = 0
+        self.__skipped = 0
+        atexit.register(self.flush)
+
         try:
             super().__init__(file=f"{DATA_DIR}/user_options.json")
         except FileNotFoundError:
             pass
 
+    def save_to_file(self, file: str):
+        self.__pending_file = file
+        if self.__write_id == 0:
+            self.__write_id = GLib.timeout_add(self.__write_delay, self.__on_write)
+
+    def __on_write(self) -> bool:
+        self.__write_id = 0
+        self.flush()
+        return GLib.SOURCE_REMOVE
+
+    def flush(self):
+        if self.__write_id != 0:
+            GLib.source_remove(self.__write_id)
+            self.__write_id = 0
+
+        file, self.__pending_file = self.__pending_file, None
+        if file is None:
+            return
+
+        content = json.dumps(self.to_dict(), indent=2)
+        if file not in self.__written and os.path.exists(file):
+            with open(file) as fp:
+                self.__written[file] = fp.read()
+        if self.__written.get(file) == content:
+            self.__skipped += 1
+            return
+
+        try:
+            with open(f"{file}.tmp", "w") as fp:
+                fp.write(content)
+            os.replace(f"{file}.tmp", file)
+        except OSError as e:
+            logger.warning(f"failed to write {file}: {e}")
+            return
+
+        self.__written[file] = content
+        self.__writes += 1
+
+    def stats(self) -> dict[str, int]:
+        return {"writes": self.__writes, "skipped": self.__skipped}
+
     class AppLauncher(OptionsGroup):
         exclusive_focus: bool = True
         command_format: str = "%command%"
@@ -1,14 +1,22 @@
+import asyncio
 import base64
+import math
 import os
+import re
 import shlex
+import subprocess
+import time
+import weakref
 from asyncio import create_task
 from typing import Any, Callable
 from gi.repository import Gdk, Gio, GLib, GObject, Gtk, Pango
+from loguru import logger
 from ignis.widgets import Window
-from ignis.services.applications import Application
+from ignis.services.applications import Application, ApplicationsService
+from ignis.services.hyprland import HyprlandService
 from ignis.services.niri import NiriService
 from ignis.options_manager import OptionsGroup
-from ignis.utils import debounce, exec_sh_async, get_app_icon_name as ignis_get_app_icon_name, get_monitor
+from ignis.utils import get_app_icon_name as ignis_get_app_icon_name, get_monitor
 
 
 ScrollFlags = Gtk.EventControllerScrollFlags
@@ -19,18 +27,134 @@ app_id_overrides: dict[str, str] = {}
 
 
 class Pool[T]():
-    def __init__(self, provider: Callable[[], T]):
+    """
+    keeps at most `max_idle` released values for reuse,
+    values that stay idle for `trim_delay` milliseconds are dropped, except for the `prewarm` ones,
+    which are built in slices when the main loop is idle, once the owner of the pool calls `prewarm()`
+    """
+
+    instances: "weakref.WeakSet[Pool]" = weakref.WeakSet()
+
+    def __init__(
+        self,
+        provider: Callable[[], T],
+        name: str | None = None,
+        max_idle: int = 32,
+        trim_delay: int = 30000,
+        prewarm: int = 0,
+    ):
         self.__pool: list[T] = []
         self.__provider = provider
+        self.__name = name or getattr(provider, "__qualname__", repr(provider))
+        self.__max_idle = max_idle
+        self.__trim_delay = trim_delay
+        self.__trim_id = 0
+        # the least idle size since last trim, those values were not needed during the period
+        self.__low_water = 0
+
+        self.acquires = 0
+        self.releases = 0
+        self.misses = 0
+        self.high_water = 0
+        self.dropped = 0
+        self.prewarmed = 0
+
+        self.__prewarm = min(prewarm, max_idle)
+        self.__prewarm_id = 0
+        Pool.instances.add(self)
+
+    @property
+    def name(self) -> str:
+        return self.__name
+
+    @property
+    def idle(self) -> int:
+        return len(self.__pool)
 
     def acquire(self) -> T:
+        self.acquires += 1
         if len(self.__pool) == 0:
+            self.misses += 1
             return self.__provider()
-        else:
-            return self.__pool.pop()
+
+        value = self.__pool.pop()
+        self.__low_water = min(self.__low_water, len(self.__pool))
+        return value
 
     def release(self, value: T):
+        self.releases += 1
+        if len(self.__pool) >= self.__max_idle:
+            self.dropped += 1
+            return
+
         self.__pool.append(value)
+        self.high_water = max(self.high_water, len(self.__pool))
+        if self.__trim_id == 0:
+            self.__low_water = len(self.__pool)
+            self.__trim_id = GLib.timeout_add(self.__trim_delay, self.__on_trim)
+
+    def __on_trim(self) -> bool:
+        count = min(self.__low_water, len(self.__pool) - self.__prewarm)
+        if count > 0:
+            del self.__pool[:count]
+            self.dropped += count
+
+        self.__low_water = len(self.__pool)
+        if len(self.__pool) > self.__prewarm:
+            return GLib.SOURCE_CONTINUE
+
+        self.__trim_id = 0
+        return GLib.SOURCE_REMOVE
+
+    def prewarm(self, target: int | None = None, slice: int = 2):
+        """
+        fills the pool up to `target` idle values, or to the declared `prewarm`, `slice` values per idle callback
+        """
+        if target is not None:
+            self.__prewarm = min(target, self.__max_idle)
+        if self.__prewarm_id != 0 or len(self.__pool) >= self.__prewarm:
+            return
+
+        def on_idle() -> bool:
+            for _ in range(slice):
+                if len(self.__pool) >= self.__prewarm:
+                    break
+                self.__pool.append(self.__provider())
+                self.prewarmed += 1
+            self.high_water = max(self.high_water, len(self.__pool))
+
+            if len(self.__pool) < self.__prewarm:
+                return GLib.SOURCE_CONTINUE
+            self.__prewarm_id = 0
+            return GLib.SOURCE_REMOVE
+
+        self.__prewarm_id = GLib.idle_add(on_idle, priority=GLib.PRIORITY_LOW)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "idle": len(self.__pool),
+            "max_idle": self.__max_idle,
+            "prewarm": self.__prewarm,
+            "prewarmed": self.prewarmed,
+            "acquires": self.acquires,
+            "releases": self.releases,
+            "misses": self.misses,
+            "high_water": self.high_water,
+            "dropped": self.dropped,
+        }
+
+    @classmethod
+    def report(cls) -> dict[str, dict[str, int]]:
+        """
+        stats of all living pools, pools of the same name are summed up
+        """
+        report: dict[str, dict[str, int]] = {}
+        for pool in list(cls.instances):
+            stats = pool.stats()
+            total = report.setdefault(pool.name, {k: 0 for k in stats})
+            for key, value in stats.items():
+                total[key] = max(total[key], value) if key == "high_water" else total[key] + value
+        return report
 
 
 def b64enc(input: str) -> str:
@@ -48,9 +172,164 @@ def get_app_id(app_id: str) -> str:
     return app_id
 
 
+class AppIndex:
+    """
+    maps window app ids to applications by desktop id, `StartupWMClass`, flatpak id and executable name,
+    updated incrementally when the applications list changes
+    """
+
+    # executables that only launch the real program
+    launchers = {"env", "sh", "bash", "flatpak", "gtk-launch", "python", "python3", "snap", "steam"}
+
+    def __init__(self):
+        self.__apps: dict[str, Application] = {}
+        # dict[app id, keys of the app]
+        self.__keys: dict[str, list[str]] = {}
+        # dict[key, dict[app id, priority]], the lower the priority, the better the match
+        self.__candidates: dict[str, dict[str, int]] = {}
+        # dict[key, best matching app]
+        self.__index: dict[str, Application] = {}
+        self.__service: ApplicationsService | None = None
+
+    def __connect(self):
+        self.__service = ApplicationsService.get_default()
+        self.__service.connect("notify::apps", self.__on_apps_changed)
+        self.__on_apps_changed()
+
+    @staticmethod
+    def normalize(app_id: str) -> str:
+        if app_id.lower().endswith(".desktop"):
+            app_id = app_id[:-8]
+        return app_id_overrides.get(app_id, app_id).lower()
+
+    @classmethod
+    def __app_keys(cls, app: Application) -> list[tuple[str, int]]:
+        app_id = cls.normalize(app.id or "")
+        keys = [(app_id, 0)]
+
+        app_info: Gio.DesktopAppInfo = app.app
+        wm_class = app_info.get_startup_wm_class()
+        if wm_class:
+            keys.append((wm_class.lower(), 1))
+        flatpak = app_info.get_string("X-Flatpak")
+        if flatpak:
+            keys.append((flatpak.lower(), 2))
+        executable = os.path.basename(app_info.get_executable() or "").lower()
+        if executable and executable not in cls.launchers:
+            keys.append((executable, 3))
+        # "org.gnome.Nautilus" is also known as "nautilus"
+        if "." in app_id:
+            keys.append((app_id.rsplit(".", 1)[-1], 4))
+        return keys
+
+    def __on_apps_changed(self, *_):
+        assert self.__service is not None
+        apps = {app.id: app for app in self.__service.apps if app.id}
+
+        changed: set[str] = set()
+        for app_id in [app_id for app_id, app in self.__apps.items() if apps.get(app_id) is not app]:
+            del self.__apps[app_id]
+            for key in self.__keys.pop(app_id, []):
+                self.__candidates[key].pop(app_id, None)
+                changed.add(key)
+        for app_id, app in apps.items():
+            if app_id in self.__apps:
+                continue
+            self.__apps[app_id] = app
+            self.__keys[app_id] = []
+            for key, priority in self.__app_keys(app):
+                if not key:
+                    continue
+                self.__keys[app_id].append(key)
+                candidates = self.__candidates.setdefault(key, {})
+                candidates[app_id] = min(priority, candidates.get(app_id, priority))
+                changed.add(key)
+
+        for key in changed:
+            candidates = self.__candidates.get(key)
+            if not candidates:
+                self.__candidates.pop(key, None)
+                self.__index.pop(key, None)
+                continue
+            best = min(candidates, key=lambda app_id: (candidates[app_id], app_id))
+            self.__index[key] = self.__apps[best]
+
+    def lookup(self, app_id: str | None) -> Application | None:
+        if self.__service is None:
+            self.__connect()
+        return self.__index.get(self.normalize(app_id or ""))
+
+    def resolve_id(self, app_id: str | None) -> str:
+        """
+        the normalized id of the matching application, or of `app_id` itself
+        """
+        app = self.lookup(app_id)
+        return get_app_id(app.id if app and app.id else app_id or "")
+
+
+app_index = AppIndex()
+
+
+class AppIconCache:
+    """
+    memoizes icon names by normalized app id and application,
+    cleared when the icon theme or the applications list changes
+    """
+
+    def __init__(self):
+        self.__icons: dict[tuple[str, Application | None], str] = {}
+        self.__connected = False
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def __connect(self):
+        display = Gdk.Display.get_default()
+        if display is None:
+            return
+
+        self.__connected = True
+        Gtk.IconTheme.get_for_display(display).connect("changed", self.invalidate)
+        ApplicationsService.get_default().connect("notify::apps", self.invalidate)
+
+    def invalidate(self, *_):
+        self.__icons.clear()
+        self.invalidations += 1
+
+    def lookup(self, app_id: str, app_info: Application | None = None) -> str:
+        if not self.__connected:
+            self.__connect()
+
+        key = (app_id, app_info)
+        icon = self.__icons.get(key)
+        if icon is not None:
+            self.hits += 1
+            return icon
+
+        self.misses += 1
+        icon = self.__icons[key] = resolve_app_icon_name(app_id, app_info)
+        return icon
+
+    def stats(self) -> dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self.__icons),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "invalidations": self.invalidations,
+        }
+
+
+app_icon_cache = AppIconCache()
+
+
 def get_app_icon_name(app_id: str | None = None, app_info: Application | None = None) -> str:
     app_id = app_id or app_info and app_info.id or ""
-    app_id = get_app_id(app_id)
+    return app_icon_cache.lookup(get_app_id(app_id), app_info or app_index.lookup(app_id))
+
+
+def resolve_app_icon_name(app_id: str, app_info: Application | None = None) -> str:
     icon = app_info and app_info.icon
     if not icon:
         icon = ignis_get_app_icon_name(app_id)
@@ -67,15 +346,235 @@ def niri_action(action: str, args: Any = {}):
         return niri.send_command({"Action": {action: args}})
 
 
+shell_syntax_pattern = re.compile(r"[;&|<>$`(){}*?~\n]")
+niri_workspace_actions = {"focus-workspace", "move-column-to-workspace", "move-window-to-workspace"}
+
+
+def parse_niri_action(argv: list[str]) -> tuple[str, Any] | None:
+    """
+    `["center-column"]` -> `("CenterColumn", {})`, for actions without arguments and a few common ones
+    """
+    if not argv or argv[0].startswith("-"):
+        return None
+
+    name, args = argv[0], argv[1:]
+    action = "".join(word.capitalize() for word in name.split("-"))
+    match args:
+        case []:
+            return action, {}
+        case ["--id", id] if id.isdigit():
+            return action, {"id": int(id)}
+        case ["--", *command] if name == "spawn" and command:
+            return action, {"command": command}
+        case [reference] if name in niri_workspace_actions:
+            return action, {"reference": {"Index": int(reference)} if reference.isdigit() else {"Name": reference}}
+    return None
+
+
+def compile_command(cmd: str, key: str | None = None) -> Callable[[], Any]:
+    """
+    `niri msg action ...` and `hyprctl dispatch ...` commands are sent over the compositor sockets,
+    other commands are run in a shell
+    """
+
+    def run_shell():
+        return run_cmd_async(cmd, key)
+
+    if shell_syntax_pattern.search(cmd):
+        return run_shell
+
+    try:
+        argv = shlex.split(cmd)
+    except ValueError:
+        return run_shell
+
+    match argv:
+        case ["niri", "msg", "action", *action_argv]:
+            action = parse_niri_action(action_argv)
+            if action is None:
+                return run_shell
+
+            def run_niri():
+                niri = NiriService.get_default()
+                if not niri.is_available:
+                    return run_shell()
+                return niri.send_command({"Action": {action[0]: action[1]}})
+
+            return run_niri
+        case ["hyprctl", "dispatch", dispatcher, *args] if not dispatcher.startswith("-"):
+            command = " ".join(["dispatch", dispatcher, *args])
+
+            def run_hyprctl():
+                hypr = HyprlandService.get_default()
+                if not hypr.is_available:
+                    return run_shell()
+                return hypr.send_command(command)
+
+            return run_hyprctl
+    return run_shell
+
+
+class LaunchStats:
+    """
+    counts launches by spawn path, and the time from click to spawn in milliseconds
+    """
+
+    def __init__(self):
+        self.paths: dict[str, int] = {}
+        self.last = 0.0
+        self.max = 0.0
+        self.total = 0.0
+
+    def record(self, path: str, start: float):
+        elapsed = (time.perf_counter() - start) * 1000
+        self.paths[path] = self.paths.get(path, 0) + 1
+        self.last = elapsed
+        self.max = max(self.max, elapsed)
+        self.total += elapsed
+
+    def stats(self) -> dict[str, Any]:
+        count = sum(self.paths.values())
+        return {
+            "paths": self.paths,
+            "last_ms": self.last,
+            "max_ms": self.max,
+            "avg_ms": self.total / count if count else 0.0,
+        }
+
+
+launch_stats = LaunchStats()
+niri_spawn_prefix = ["niri", "msg", "action", "spawn", "--"]
+
+
+def expand_exec(app: Application, files: list[str]) -> list[str]:
+    """
+    parses the `Exec` line of `app` into argv, with field codes expanded
+    """
+    app_info: Gio.DesktopAppInfo = app.app
+    file = files[:1]
+    argv: list[str] = []
+    for arg in GLib.shell_parse_argv(app.exec_string)[1]:
+        match arg:
+            case "%f" | "%u":
+                argv.extend(file)
+            case "%F" | "%U":
+                # nautilus --new-window file1 file2
+                argv.extend(files)
+            case "%i":
+                argv.extend(["--icon", app.icon] if app.icon else [])
+            case "%c":
+                argv.append(app.name or "")
+            case "%k":
+                argv.append(app_info.get_filename() or "")
+            case _:
+                codes = {"%f": file[0] if file else "", "%u": file[0] if file else "", "%%": "%"}
+                arg = re.sub(r"%.", lambda m: codes.get(m.group(0), ""), arg)
+                if arg:
+                    argv.append(arg)
+    return argv
+
+
+def apply_exec_format(format: str | None, argv: list[str]) -> list[str]:
+    """
+    replaces the `%command%` argument of `format` with `argv`
+    """
+    if not format or format.strip() == "%command%":
+        return argv
+
+    result: list[str] = []
+    for arg in GLib.shell_parse_argv(format)[1]:
+        if arg == "%command%":
+            result.extend(argv)
+        else:
+            # e.g. `sh -c "%command% || notify-send failed"`
+            result.append(arg.replace("%command%", shlex.join(argv)))
+    return result
+
+
 def launch_application(
     app: Application,
     files: list[str] | None = None,
     command_format: str | None = None,
     terminal_format: str | None = None,
+    clicked_at: float | None = None,
 ):
+    """
+    `clicked_at` is the `time.perf_counter()` of the click that launches `app`, for `launch_stats`
+    """
     if not app.exec_string:
         return
 
+    start = time.perf_counter() if clicked_at is None else clicked_at
+    app_info: Gio.DesktopAppInfo = app.app
+    cwd = app_info.get_string("Path")
+    format = terminal_format if app.is_terminal else command_format
+
+    try:
+        argv = apply_exec_format(format, expand_exec(app, files or []))
+    except GLib.Error as e:
+        logger.warning(f"failed to parse command of {app.id}, launching via shell: {e.message}")
+        launch_application_sh(app, files, command_format, terminal_format)
+        launch_stats.record("shell", start)
+        return
+
+    if not argv:
+        return
+
+    niri = NiriService.get_default()
+    if argv[: len(niri_spawn_prefix)] == niri_spawn_prefix and not cwd and niri.is_available:
+        # niri msg action spawn -- foot yazi file
+        niri_action("Spawn", {"command": argv[len(niri_spawn_prefix) :]})
+        launch_stats.record("niri", start)
+        return
+
+    try:
+        # detached like `app.launch`, in a new session and without the shell's stdio
+        process = subprocess.Popen(
+            argv,
+            cwd=cwd or None,
+            env=launch_environment(app_info, files or []),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+        # reaped by the main loop, so that no zombie is left behind
+        GLib.child_watch_add(GLib.PRIORITY_DEFAULT, process.pid, lambda *_: None)
+        launch_stats.record("spawn", start)
+    except OSError as e:
+        logger.warning(f"failed to spawn {argv}, launching via shell: {e}")
+        launch_application_sh(app, files, command_format, terminal_format)
+        launch_stats.record("shell", start)
+
+
+def launch_environment(app_info: Gio.AppInfo, files: list[str]) -> dict[str, str]:
+    """
+    environment of a launched application, with the activation token and variables of the display's launch context,
+    as `Gio.AppInfo.launch` would pass them
+    """
+    env = dict(os.environ)
+    display = Gdk.Display.get_default()
+    if display is None:
+        return env
+
+    context = display.get_app_launch_context()
+    for variable in context.get_environment() or []:
+        name, _, value = variable.partition("=")
+        env[name] = value
+
+    token = context.get_startup_notify_id(app_info, [Gio.File.new_for_commandline_arg(file) for file in files])
+    if token:
+        env["XDG_ACTIVATION_TOKEN"] = token
+        env["DESKTOP_STARTUP_ID"] = token
+    return env
+
+
+def launch_application_sh(
+    app: Application,
+    files: list[str] | None = None,
+    command_format: str | None = None,
+    terminal_format: str | None = None,
+):
     command: str = app.exec_string
 
     # pass file paths as arguments
@@ -104,8 +603,93 @@ def launch_application(
     app.launch(command_format=command, terminal_format=command)
 
 
-def run_cmd_async(cmd: str):
-    return create_task(exec_sh_async(cmd))
+class CommandExecutor:
+    """
+    runs shell commands, starting at most `limit` shells at a time, a slot is released once its shell has started,
+    so that long running commands, e.g. daemons or applications, never block others;
+    commands of the same `key` run one after another, with a single pending slot that a newer command overwrites
+    """
+
+    def __init__(self, limit: int = 4):
+        self.__semaphore = asyncio.Semaphore(limit)
+        # commands without a key, starting or running
+        self.__tasks: set[asyncio.Task] = set()
+        # dict[key, worker task], running the commands of the key in order
+        self.__workers: dict[str, asyncio.Task] = {}
+        # dict[key, command], to be run after the running one of the key
+        self.__pending: dict[str, str] = {}
+
+        self.submitted = 0
+        self.deduplicated = 0
+        self.queued = 0
+        self.dropped = 0
+        self.completed = 0
+
+    def submit(self, cmd: str, key: str | None = None) -> asyncio.Task:
+        self.submitted += 1
+        if key is not None:
+            return self.__submit_keyed(cmd, key)
+
+        if self.__semaphore.locked():
+            self.queued += 1
+
+        task = create_task(self.__run(cmd))
+        task.add_done_callback(self.__tasks.discard)
+        self.__tasks.add(task)
+        return task
+
+    def __submit_keyed(self, cmd: str, key: str) -> asyncio.Task:
+        pending = self.__pending.get(key)
+        if pending == cmd:
+            self.deduplicated += 1
+        elif pending is not None:
+            self.dropped += 1
+        self.__pending[key] = cmd
+
+        worker = self.__workers.get(key)
+        if worker and not worker.done():
+            self.queued += 1
+            return worker
+
+        worker = create_task(self.__run_key(key))
+        worker.add_done_callback(lambda t: self.__workers.get(key) is t and self.__workers.pop(key))
+        self.__workers[key] = worker
+        return worker
+
+    async def __run_key(self, key: str):
+        while (cmd := self.__pending.pop(key, None)) is not None:
+            try:
+                await self.__run(cmd)
+            except Exception as e:
+                logger.warning(f"command `{cmd}` failed: {e}")
+
+    async def __run(self, cmd: str) -> subprocess.CompletedProcess:
+        async with self.__semaphore:
+            process = await asyncio.create_subprocess_shell(
+                cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+            )
+        stdout, stderr = await process.communicate()
+        self.completed += 1
+        return subprocess.CompletedProcess(
+            cmd, process.returncode, stdout.decode(errors="replace"), stderr.decode(errors="replace")
+        )
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "submitted": self.submitted,
+            "deduplicated": self.deduplicated,
+            "queued": self.queued,
+            "dropped": self.dropped,
+            "completed": self.completed,
+            "pending": len(self.__tasks) + len(self.__workers) + len(self.__pending),
+        }
+
+
+command_executor = CommandExecutor()
+
+
+def run_cmd_async(cmd: str, key: str | None = None):
+    return command_executor.submit(cmd, key)
 
 
 def clear_dir(dirpath: str):
@@ -162,11 +746,185 @@ def connect_window(widget: Gtk.Widget, signal: str, callback: Callable[..., Any]
     widget.connect("realize", on_realize)
 
 
-def connect_option(group: OptionsGroup, option: str, callback: Callable):
+def connect_mapped(widget: Gtk.Widget, callback: Callable[[], Any]):
+    """
+    calls `callback` once, when `widget` is first mapped, i.e. actually shown
+    """
+    if widget.get_mapped():
+        callback()
+        return
+
+    def on_map(*_):
+        widget.disconnect(handler_id)
+        callback()
+
+    handler_id = widget.connect("map", on_map)
+
+
+class OptionDispatcher:
+    """
+    coalesces option changes, callbacks of all pending changes are run in one flush before the next frame is drawn,
+    or once no further change arrives within the `latency` milliseconds of their binding
+    """
+
+    def __init__(self):
+        # dict[binding, (due time, callback, args)]
+        self.__pending: dict[Any, tuple[float, Callable, tuple]] = {}
+        self.__flush_id = 0
+        self.__timeout_id = 0
+        self.__timeout_due = 0.0
+
+        self.scheduled = 0
+        self.coalesced = 0
+        self.cancelled = 0
+        self.failed = 0
+        self.flushes = 0
+
+    def schedule(self, binding: Any, callback: Callable, args: tuple, latency: int = 0):
+        self.scheduled += 1
+        if binding in self.__pending:
+            self.coalesced += 1
+
+        due = time.monotonic() + latency / 1000
+        self.__pending[binding] = (due, callback, args)
+        self.__arm(due)
+
+    def unschedule(self, binding: Any):
+        """
+        drops the pending callback of `binding`, e.g. when its handler is disconnected
+        """
+        if self.__pending.pop(binding, None) is not None:
+            self.cancelled += 1
+
+    def __arm(self, due: float):
+        delay = math.ceil((due - time.monotonic()) * 1000)
+        if delay <= 0:
+            if self.__flush_id == 0:
+                # before gtk relayouts and redraws
+                self.__flush_id = GLib.idle_add(self.__flush, priority=GLib.PRIORITY_HIGH_IDLE)
+        elif self.__timeout_id == 0 or due < self.__timeout_due:
+            if self.__timeout_id != 0:
+                GLib.source_remove(self.__timeout_id)
+            self.__timeout_due = due
+            self.__timeout_id = GLib.timeout_add(delay, self.__on_timeout)
+
+    def __on_timeout(self) -> bool:
+        self.__timeout_id = 0
+        if self.__flush_id == 0:
+            self.__flush_id = GLib.idle_add(self.__flush, priority=GLib.PRIORITY_HIGH_IDLE)
+        return GLib.SOURCE_REMOVE
+
+    def __flush(self) -> bool:
+        self.__flush_id = 0
+        self.flushes += 1
+
+        now = time.monotonic()
+        due = [(binding, entry) for binding, entry in self.__pending.items() if entry[0] <= now + 0.001]
+        for binding, _ in due:
+            del self.__pending[binding]
+        for binding, (_, callback, args) in due:
+            try:
+                callback(*args)
+            except Exception as e:
+                self.failed += 1
+                logger.exception(f"option callback {binding} failed: {e}")
+
+        if self.__pending:
+            self.__arm(min(entry[0] for entry in self.__pending.values()))
+        return GLib.SOURCE_REMOVE
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "scheduled": self.scheduled,
+            "coalesced": self.coalesced,
+            "cancelled": self.cancelled,
+            "failed": self.failed,
+            "flushes": self.flushes,
+            "pending": len(self.__pending),
+        }
+
+
+option_dispatcher = OptionDispatcher()
+
+
+def connect_option(
+    group: OptionsGroup, option: str, callback: Callable, latency: int = 0
+) -> tuple[GObject.Object, int]:
+    """
+    `callback` is run by `option_dispatcher`, at most once per flush,
+    and only after the option stays unchanged for `latency` milliseconds;
+    the returned handler should be disconnected by `disconnect_handlers`, which also drops its pending callback
+    """
     binding = group.bind(option)
     source: GObject.Object = binding.target
     source_property: str = binding.target_properties[0]
-    source.connect(f"notify::{source_property.replace("-", "_")}", debounce(500)(callback))
+
+    def on_changed(*args):
+        option_dispatcher.schedule(handler, callback, args, latency)
+
+    handler = (source, source.connect(f"notify::{source_property.replace("-", "_")}", on_changed))
+    return handler
+
+
+def disconnect_handlers(handlers: list[tuple[GObject.Object, int]]):
+    """
+    disconnects signal handlers, including ones returned by `connect_option` and `bind_option`
+    """
+    for source, handler_id in handlers:
+        option_dispatcher.unschedule((source, handler_id))
+        if source.handler_is_connected(handler_id):
+            source.disconnect(handler_id)
+    handlers.clear()
+
+
+# callbacks registered by `on_destroy`, by widget
+widget_releases: "weakref.WeakKeyDictionary[Gtk.Widget, list[Callable[[], Any]]]" = weakref.WeakKeyDictionary()
+
+
+def run_releases(callbacks: list[Callable[[], Any]]):
+    while callbacks:
+        callback = callbacks.pop(0)
+        try:
+            callback()
+        except Exception:
+            logger.exception("widget release callback failed")
+
+
+def on_destroy(widget: Gtk.Widget, callback: Callable[[], Any]):
+    """
+    calls `callback` once, when `widget` is destroyed or released by `release_widget_tree`, whichever comes first
+    """
+    callbacks = widget_releases.get(widget)
+    if callbacks is None:
+        callbacks = widget_releases[widget] = []
+        widget.connect("destroy", lambda *_: run_releases(callbacks))
+    callbacks.append(callback)
+
+
+def release_widget_tree(widget: Gtk.Widget):
+    """
+    runs `on_destroy` callbacks of `widget` and all its descendants;
+    widgets referenced by service handlers are never disposed, so they would not emit "destroy" by themselves
+    """
+    callbacks = widget_releases.get(widget)
+    if callbacks:
+        run_releases(callbacks)
+
+    child = widget.get_first_child()
+    while child is not None:
+        release_widget_tree(child)
+        child = child.get_next_sibling()
+
+
+def disconnect_on_destroy(
+    widget: Gtk.Widget, *handlers: tuple[GObject.Object, int]
+) -> list[tuple[GObject.Object, int]]:
+    """
+    disconnects `handlers` by `on_destroy`, handlers appended to the returned list later are included
+    """
+    handler_list = list(handlers)
+    on_destroy(widget, lambda: disconnect_handlers(handler_list))
+    return handler_list
 
 
 def bind_option(
@@ -177,7 +935,11 @@ def bind_option(
     flags: GObject.BindingFlags = GObject.BindingFlags.BIDIRECTIONAL,
     transform_to: Callable | None = None,
     transform_from: Callable | None = None,
-):
+) -> list[tuple[GObject.Object, int]]:
+    """
+    returns connected signal handlers, to be disconnected when `target` is disposed
+    """
+
     # target.property = transform_to(group.option)
     def on_option_changed(*_):
         value = getattr(group, option)
@@ -186,7 +948,7 @@ def bind_option(
         if target.get_property(target_property) != value:
             target.set_property(target_property, value)
 
-    connect_option(group, option, on_option_changed)
+    handlers = [connect_option(group, option, on_option_changed)]
     on_option_changed()
 
     if flags | GObject.BindingFlags.BIDIRECTIONAL == flags:
@@ -199,7 +961,9 @@ def bind_option(
             if getattr(group, option) != value:
                 setattr(group, option, value)
 
-        target.connect(f"notify::{target_property}", on_option_set)
+        handlers.append((target, target.connect(f"notify::{target_property}", on_option_set)))
+
+    return handlers
 
 
 def set_on_click[Widget: Gtk.Widget](
@@ -208,22 +972,25 @@ def set_on_click[Widget: Gtk.Widget](
     middle: Callable[[Widget], Any] | None = None,
     right: Callable[[Widget], Any] | None = None,
 ) -> Widget:
-    def on_released(callback: Callable[[Widget], Any]):
-        def handler(gesture_click: Gtk.GestureClick, n_press: int, x: int, y: int):
-            if widget.contains(x, y):
-                gesture_click.set_state(Gtk.EventSequenceState.CLAIMED)
-                callback(widget)
-
-        return handler
-
-    def set_controller(widget: Gtk.Widget, button: int, callback: Callable[[Widget], Any] | None):
-        if callback:
-            controller = Gtk.GestureClick(button=button)
-            widget.add_controller(controller)
-            controller.connect("released", on_released(callback))
-
-    for button, callback in [(Gdk.BUTTON_PRIMARY, left), (Gdk.BUTTON_MIDDLE, middle), (Gdk.BUTTON_SECONDARY, right)]:
-        set_controller(widget, button, callback)
+    callbacks = {Gdk.BUTTON_PRIMARY: left, Gdk.BUTTON_MIDDLE: middle, Gdk.BUTTON_SECONDARY: right}
+    if not any(callbacks.values()):
+        return widget
+
+    def on_pressed(gesture_click: Gtk.GestureClick, n_press: int, x: int, y: int):
+        # leave buttons without callbacks to other controllers
+        if not callbacks.get(gesture_click.get_current_button()):
+            gesture_click.set_state(Gtk.EventSequenceState.DENIED)
+
+    def on_released(gesture_click: Gtk.GestureClick, n_press: int, x: int, y: int):
+        callback = callbacks.get(gesture_click.get_current_button())
+        if callback and widget.contains(x, y):
+            gesture_click.set_state(Gtk.EventSequenceState.CLAIMED)
+            callback(widget)
+
+    controller = Gtk.GestureClick(button=0)
+    widget.add_controller(controller)
+    controller.connect("pressed", on_pressed)
+    controller.connect("released", on_released)
 
     return widget
 
@@ -4,7 +4,7 @@ from ignis.services.niri import NiriService
 from ignis.utils.monitor import get_monitor
 from ignis.options import options
 from .useroptions import user_options
-from .utils import connect_option
+from .utils import connect_option, disconnect_on_destroy
 
 
 niri = NiriService.get_default()
@@ -34,18 +34,15 @@ class BlurredPicture(Gtk.Picture):
 class WallpaperWindow(Window):
     __gtype_name__ = "IgnisBackdropWallpaper"
 
-    def __init__(self, monitor_idx: int, is_backdrop: bool = False):
+    def __init__(self, monitor_idx: int, is_backdrop: bool = False, name: str | None = None):
         self.__is_backdrop = is_backdrop
         self.__picture = BlurredPicture()
         self.__picture.set_content_fit(Gtk.ContentFit.COVER)
+        self.__fit_monitor(monitor_idx)
 
-        monitor = get_monitor(monitor_idx)
-        if monitor:
-            geometry = monitor.get_geometry()
-            self.__picture.set_size_request(geometry.width, geometry.height)
-
+        name = str(monitor_idx) if name is None else name
         super().__init__(
-            namespace=f"ignis_wallpaper_{"backdrop" if is_backdrop else "service"}_{monitor_idx}",
+            namespace=f"ignis_wallpaper_{"backdrop" if is_backdrop else "service"}_{name}",
             monitor=monitor_idx,
             anchor=["top", "right", "bottom", "left"],
             exclusivity="ignore",
@@ -62,20 +59,30 @@ class WallpaperWindow(Window):
         self.__on_overview_opened()
         self.__on_blur_radius_changed()
         self.__on_margin_changed()
+        # index shifts when a monitor before it is removed
+        self.connect("notify::monitor", lambda *_: self.__fit_monitor(self.monitor))
 
+        handlers = disconnect_on_destroy(self)
         if niri.is_available:
-            niri.connect("notify::overview-opened", self.__on_overview_opened)
+            handlers.append((niri, niri.connect("notify::overview-opened", self.__on_overview_opened)))
 
         if options and options.wallpaper:
-            connect_option(options.wallpaper, "wallpaper_path", self.__load_picture)
+            handlers.append(connect_option(options.wallpaper, "wallpaper_path", self.__load_picture, latency=200))
 
         if user_options and user_options.wallpaper:
+            opts = user_options.wallpaper
             if is_backdrop:
-                connect_option(user_options.wallpaper, "backdrop_blur_radius", self.__on_blur_radius_changed)
-                connect_option(user_options.wallpaper, "backdrop_bottom_margin", self.__on_margin_changed)
+                handlers.append(connect_option(opts, "backdrop_blur_radius", self.__on_blur_radius_changed))
+                handlers.append(connect_option(opts, "backdrop_bottom_margin", self.__on_margin_changed))
             else:
-                connect_option(user_options.wallpaper, "blur_radius", self.__on_blur_radius_changed)
-                connect_option(user_options.wallpaper, "bottom_margin", self.__on_margin_changed)
+                handlers.append(connect_option(opts, "blur_radius", self.__on_blur_radius_changed))
+                handlers.append(connect_option(opts, "bottom_margin", self.__on_margin_changed))
+
+    def __fit_monitor(self, monitor_idx: int):
+        monitor = get_monitor(monitor_idx)
+        if monitor:
+            geometry = monitor.get_geometry()
+            self.__picture.set_size_request(geometry.width, geometry.height)
 
     def __on_blur_radius_changed(self, *_):
         opts = user_options and user_options.wallpaper
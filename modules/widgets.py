@@ -1,9 +1,17 @@
-from typing import Any
+import time
+from typing import Any, Callable
 from gi.repository import Gtk
+from loguru import logger
+from ignis.utils import Timeout
 from ignis.widgets import Window
+from ignis.window_manager import WindowManager
+from .tracer import tracer
 from .utils import gproperty
 
 
+wm = WindowManager.get_default()
+
+
 class RevealerWindow(Window):
     __gtype_name__ = "MyRevealerWindow"
 
@@ -37,3 +45,75 @@ class RevealerWindow(Window):
     @visible.setter
     def visible(self, visible: bool):
         super().set_visible(visible)
+
+
+class LazyWindow:
+    """
+    a placeholder registered in `WindowManager`, which builds the real window when it is first shown;
+    with `release_delay` set, the window is destroyed after being hidden for that many milliseconds
+    """
+
+    def __init__(self, namespace: str, factory: Callable[[], Gtk.Window], release_delay: int | None = None):
+        self.__namespace = namespace
+        self.__factory = factory
+        self.__release_delay = release_delay
+        self.__release_timeout: Timeout | None = None
+        self.__window: Gtk.Window | None = None
+        wm.add_window(namespace, self)  # type: ignore
+
+    @property
+    def namespace(self) -> str:
+        return self.__namespace
+
+    @property
+    def window(self) -> Gtk.Window | None:
+        return self.__window
+
+    def build(self) -> Gtk.Window:
+        if self.__window is None:
+            # the real window registers itself under the same name
+            wm.remove_window(self.__namespace)
+            start = time.perf_counter()
+            with tracer.span(f"window {self.__namespace}", "window"):
+                self.__window = self.__factory()
+            logger.info(f"window `{self.__namespace}` built in {(time.perf_counter() - start) * 1000:.1f} ms")
+            if self.__release_delay is not None:
+                self.__window.connect("notify::visible", self.__on_visible_changed)
+        return self.__window
+
+    def release(self, *_):
+        """
+        destroys the hidden window, and registers the placeholder again
+        """
+        self.__release_timeout = None
+        window = self.__window
+        if window is None or window.get_visible():
+            return
+
+        self.__window = None
+        wm.remove_window(self.__namespace)
+        window.destroy()
+        wm.add_window(self.__namespace, self)  # type: ignore
+        logger.info(f"window `{self.__namespace}` released")
+
+    def __on_visible_changed(self, window: Gtk.Window, *_):
+        if self.__release_timeout:
+            self.__release_timeout.cancel()
+            self.__release_timeout = None
+        if self.__release_delay is not None and window is self.__window and not window.get_visible():
+            self.__release_timeout = Timeout(ms=self.__release_delay, target=self.release)
+
+    def get_visible(self) -> bool:
+        return self.__window.get_visible() if self.__window else False
+
+    def set_visible(self, visible: bool):
+        if visible or self.__window:
+            self.build().set_visible(visible)
+
+    @property
+    def visible(self) -> bool:
+        return self.get_visible()
+
+    @visible.setter
+    def visible(self, visible: bool):
+        self.set_visible(visible)
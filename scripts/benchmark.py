@@ -0,0 +1,381 @@
+"""
+Benchmarks view construction with fake services.
+
+This file is an ignis config, run by `scripts/benchmark.sh` under a headless compositor.
+Sizes are configured by environment variables:
+
+- IGNIS_BENCH_ROUNDS: rounds per view (default 5)
+- IGNIS_BENCH_APPS: applications (default 200)
+- IGNIS_BENCH_WINDOWS: compositor windows (default 50)
+- IGNIS_BENCH_WORKSPACES: workspaces (default 10)
+- IGNIS_BENCH_NOTIFICATIONS: notifications (default 50)
+- IGNIS_BENCH_CLICK_WIDGETS: widgets with click handlers (default 500)
+"""
+
+import json, os, sys, time, tracemalloc
+from typing import Any, Callable
+
+config_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, config_dir)
+
+from gi.repository import Gio, GLib, GObject, Gtk
+from ignis import CACHE_DIR
+from ignis.app import IgnisApp
+from ignis.services.applications import Application, ApplicationsService
+from ignis.services.hyprland import HyprlandService
+from ignis.services.niri import NiriService
+from ignis.services.notifications import NotificationService
+
+
+def env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+rounds = env_int("IGNIS_BENCH_ROUNDS", 5)
+n_apps = env_int("IGNIS_BENCH_APPS", 200)
+n_windows = env_int("IGNIS_BENCH_WINDOWS", 50)
+n_workspaces = env_int("IGNIS_BENCH_WORKSPACES", 10)
+n_notifications = env_int("IGNIS_BENCH_NOTIFICATIONS", 50)
+n_click_widgets = env_int("IGNIS_BENCH_CLICK_WIDGETS", 500)
+
+
+class FakeNiriWorkspace(GObject.Object):
+    def __init__(self, id: int):
+        super().__init__()
+        self.id = id
+        self.idx = id
+        self.name = ""
+        # views are not placed in layer windows here, so their connectors are None
+        self.output = None
+        self.is_active = id == 1
+
+    def switch_to(self):
+        pass
+
+
+class FakeNiriWindow(GObject.Object):
+    def __init__(self, id: int, app_id: str, workspace_id: int):
+        super().__init__()
+        self.id = id
+        self.pid = 1000 + id
+        self.app_id = app_id
+        self.title = f"{app_id} window {id}"
+        self.workspace_id = workspace_id
+        self.is_floating = False
+
+    def focus(self):
+        pass
+
+
+class FakeNiriService(GObject.Object):
+    # views connect to `notify::` of these, so they are gobject properties rather than plain attributes
+    workspaces = GObject.Property(type=object)
+    windows = GObject.Property(type=object)
+    active_window = GObject.Property(type=object)
+    active_workspace = GObject.Property(type=object)
+    overview_opened = GObject.Property(type=bool, default=False)
+
+    def __init__(self, app_ids: list[str]):
+        super().__init__()
+        self.is_available = True
+        self.overview_opened = False
+        self.workspaces = [FakeNiriWorkspace(i + 1) for i in range(n_workspaces)]
+        self.windows = [
+            FakeNiriWindow(i + 1, app_ids[i % len(app_ids)] if app_ids else "unknown", i % n_workspaces + 1)
+            for i in range(n_windows)
+        ]
+        self.active_window = self.windows[0] if self.windows else FakeNiriWindow(0, "", 0)
+        self.active_workspace = self.workspaces[0] if self.workspaces else FakeNiriWorkspace(0)
+
+    def send_command(self, *_):
+        pass
+
+
+class FakeHyprlandService(GObject.Object):
+    windows = GObject.Property(type=object)
+    workspaces = GObject.Property(type=object)
+    monitors = GObject.Property(type=object)
+
+    def __init__(self):
+        super().__init__()
+        self.is_available = False
+        self.windows = []
+        self.workspaces = []
+        self.monitors = []
+
+
+class FakeApplicationsService(GObject.Object):
+    apps = GObject.Property(type=object)
+    pinned = GObject.Property(type=object)
+
+    def __init__(self):
+        super().__init__()
+        self.apps = [self.__new_app(i) for i in range(n_apps)]
+        self.pinned = self.apps[:8]
+
+    @classmethod
+    def __new_app(cls, idx: int) -> Application:
+        keyfile = GLib.KeyFile()
+        keyfile.set_string("Desktop Entry", "Type", "Application")
+        keyfile.set_string("Desktop Entry", "Name", f"Benchmark App {idx}")
+        keyfile.set_string("Desktop Entry", "Comment", f"benchmark application number {idx}")
+        keyfile.set_string("Desktop Entry", "Exec", "true %F")
+        keyfile.set_string("Desktop Entry", "Icon", "application-x-executable")
+        return Application(app=Gio.DesktopAppInfo.new_from_keyfile(keyfile), is_pinned=idx < 8)
+
+
+class FakeNotification(GObject.Object):
+    @GObject.Signal
+    def closed(self):
+        pass
+
+    @GObject.Signal
+    def dismissed(self):
+        pass
+
+    def __init__(self, id: int):
+        super().__init__()
+        self.id = id
+        self.time = time.time() - id
+        self.app_name = "benchmark"
+        self.icon = "dialog-information-symbolic"
+        self.summary = f"Notification {id}"
+        self.body = f"body of notification <b>{id}</b>"
+        self.urgency = id % 3
+        self.actions = []
+
+    def dismiss(self):
+        self.emit("dismissed")
+
+    def close(self):
+        self.emit("closed")
+
+
+class FakeNotificationService(GObject.Object):
+    @GObject.Signal(arg_types=(object,))
+    def notified(self, notification: Any):
+        pass
+
+    @GObject.Signal(arg_types=(object,))
+    def new_popup(self, notification: Any):
+        pass
+
+    def __init__(self):
+        super().__init__()
+        self.notifications = [FakeNotification(i + 1) for i in range(n_notifications)]
+
+    def clear_all(self):
+        pass
+
+
+fake_apps = FakeApplicationsService()
+fake_niri = FakeNiriService([app.id or "" for app in fake_apps.apps])
+fake_hypr = FakeHyprlandService()
+fake_notifications = FakeNotificationService()
+
+ApplicationsService.get_default = lambda: fake_apps  # type: ignore
+NiriService.get_default = lambda: fake_niri  # type: ignore
+HyprlandService.get_default = lambda: fake_hypr  # type: ignore
+NotificationService.get_default = lambda: fake_notifications  # type: ignore
+
+import modules.adw as _
+from modules.template import prebuild_blueprints
+
+prebuild_blueprints()
+
+from modules.appdock import AppDockView
+from modules.applauncher import AppLauncherView
+from modules.controlcenter import ControlCenter, NotificationCenter
+from modules.modules import Workspaces
+from modules.utils import set_on_click
+
+
+app = IgnisApp.get_initialized()
+
+
+def rss_kib() -> int:
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+
+
+def wait_first_frame(window: Gtk.Window) -> float:
+    """
+    presents `window` and iterates the main context until its first frame is painted
+    """
+    start = time.perf_counter()
+    painted: list[float] = []
+
+    def on_map(*_):
+        clock = window.get_frame_clock()
+        if clock:
+            clock.connect("after-paint", lambda *_: painted or painted.append(time.perf_counter()))
+
+    window.connect("map", on_map)
+    window.present()
+
+    context = GLib.MainContext.default()
+    deadline = start + 10
+    while not painted and time.perf_counter() < deadline:
+        context.iteration(False)
+    return ((painted[0] if painted else time.perf_counter()) - start) * 1000
+
+
+def measure(name: str, build: Callable[[], Gtk.Widget]) -> dict[str, Any]:
+    construct: list[float] = []
+    first_frame: list[float] = []
+    py_memory: list[int] = []
+    rss: list[int] = []
+
+    for _ in range(rounds):
+        rss_before = rss_kib()
+        tracemalloc.start()
+        start = time.perf_counter()
+        view = build()
+        construct.append((time.perf_counter() - start) * 1000)
+        py_memory.append(tracemalloc.get_traced_memory()[0] // 1024)
+        tracemalloc.stop()
+
+        window = Gtk.Window(child=view, default_width=1280, default_height=720)
+        first_frame.append(wait_first_frame(window))
+        rss.append(rss_kib() - rss_before)
+        window.destroy()
+        # emits "destroy", so that views of earlier rounds disconnect from the shared fake services
+        view.run_dispose()
+
+    result = {
+        "view": name,
+        "construct_ms": min(construct),
+        "first_frame_ms": min(first_frame),
+        "python_kib": min(py_memory),
+        "rss_kib": max(rss),
+    }
+    print(
+        "%-20s construct %8.2f ms   first frame %8.2f ms   python %7d KiB   rss %7d KiB"
+        % (name, result["construct_ms"], result["first_frame_ms"], result["python_kib"], result["rss_kib"])
+    )
+    return result
+
+
+def count_children(widget: Gtk.Widget) -> int:
+    count = 0
+    child = widget.get_first_child()
+    while child is not None:
+        count += 1
+        child = child.get_next_sibling()
+    return count
+
+
+def expect_items(view: str, count: int, expected: int):
+    """
+    fails the benchmark of `view` if a refresh built nothing, which would time an empty view
+    """
+    if expected > 0 and count == 0:
+        raise RuntimeError(f"{view} has no items after refresh, the fake service signals did not reach it")
+
+
+def legacy_set_on_click(widget: Gtk.Widget, left: Callable, middle: Callable, right: Callable):
+    """
+    `set_on_click` before it shared one controller among buttons, kept for comparison
+    """
+
+    def on_released(callback: Callable):
+        def handler(gesture_click: Gtk.GestureClick, n_press: int, x: int, y: int):
+            if widget.contains(x, y):
+                gesture_click.set_state(Gtk.EventSequenceState.CLAIMED)
+                callback(widget)
+
+        return handler
+
+    for button, callback in [(1, left), (2, middle), (3, right)]:
+        controller = Gtk.GestureClick(button=button)
+        widget.add_controller(controller)
+        controller.connect("released", on_released(callback))
+
+
+def measure_click_controllers(name: str, setter: Callable) -> dict[str, Any]:
+    """
+    cost of click handlers on pooled widgets, gtk dispatches an event to every controller of the picked widgets
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    widgets = [Gtk.Box() for _ in range(n_click_widgets)]
+    for widget in widgets:
+        setter(widget, lambda _: None, lambda _: None, lambda _: None)
+    elapsed = (time.perf_counter() - start) * 1000
+    memory = tracemalloc.get_traced_memory()[0] // 1024
+    tracemalloc.stop()
+
+    controllers = sum(widget.observe_controllers().get_n_items() for widget in widgets)
+    result = {"view": name, "construct_ms": elapsed, "python_kib": memory, "controllers": controllers}
+    print("%-20s construct %8.2f ms   python %7d KiB   controllers %6d" % (name, elapsed, memory, controllers))
+    return result
+
+
+def main():
+    sizes = {
+        "apps": n_apps,
+        "windows": n_windows,
+        "workspaces": n_workspaces,
+        "notifications": n_notifications,
+        "click_widgets": n_click_widgets,
+        "rounds": rounds,
+    }
+    print(f"benchmark sizes: {sizes}")
+
+    def build_dock():
+        view = AppDockView()
+        fake_niri.notify("workspaces")
+        expect_items("AppDockView", count_children(view.flow_box), len(fake_apps.pinned) + n_windows)
+        return view
+
+    def build_workspaces():
+        view = Workspaces()
+        fake_niri.notify("workspaces")
+        expect_items("Workspaces", count_children(view), n_workspaces)
+        return view
+
+    def build_notification_center():
+        view = NotificationCenter()
+        expect_items("NotificationCenter", view._notifications.get_n_items(), n_notifications)
+        return view
+
+    def build_launcher():
+        view = AppLauncherView()
+        fake_apps.notify("apps")
+        expect_items("AppLauncherView", view.list_store.get_n_items(), n_apps)
+        return view
+
+    benchmarks: list[tuple[str, Callable[[], Gtk.Widget]]] = [
+        ("AppDockView", build_dock),
+        ("Workspaces", build_workspaces),
+        ("NotificationCenter", build_notification_center),
+        ("AppLauncherView", build_launcher),
+        # control center widgets other than notifications use live services, if there are any
+        ("ControlCenter.View", ControlCenter.View),
+    ]
+
+    results = []
+    for name, build in benchmarks:
+        try:
+            results.append(measure(name, build))
+        except Exception as e:
+            print(f"{name}: failed: {e}")
+            results.append({"view": name, "error": str(e)})
+
+    results.append(measure_click_controllers("set_on_click legacy", legacy_set_on_click))
+    results.append(
+        measure_click_controllers("set_on_click", lambda w, l, m, r: set_on_click(w, left=l, middle=m, right=r))
+    )
+
+    output = os.path.join(CACHE_DIR, "benchmark.json")
+    with open(output, "w") as file:
+        json.dump({"sizes": sizes, "results": results}, file, indent=2)
+    print(f"results written to {output}")
+
+    app.quit()
+
+
+GLib.idle_add(main)
@@ -0,0 +1,59 @@
+#!/usr/bin/env bash
+
+# Runs `benchmark.py` as an ignis config under a headless compositor,
+# so that view construction can be measured outside a live session.
+# Sizes are passed by environment variables, see `benchmark.py`.
+
+script_dir="$(dirname "$(realpath "$0")")"
+compositor_pid=0
+
+function logf() {
+    local fmt="$1"
+    shift
+    printf "${fmt}\n" "$@" >&2
+}
+
+function cleanup() {
+    if [ "${compositor_pid}" -gt 0 ]; then
+        kill "${compositor_pid}" 2>/dev/null
+    fi
+}
+
+function wait_socket() {
+    local socket="${XDG_RUNTIME_DIR}/$1"
+    for _ in $(seq 50); do
+        if [ -S "${socket}" ]; then
+            return
+        fi
+        sleep 0.1
+    done
+    logf "compositor socket %s not found" "${socket}"
+    return 1
+}
+
+function run_ignis() {
+    ignis init -c "${script_dir}/benchmark.py"
+}
+
+function main() {
+    local socket="ignis-benchmark-$$"
+    trap cleanup EXIT
+
+    if command -v weston >/dev/null; then
+        weston --backend=headless --socket="${socket}" --width=1920 --height=1080 &
+        compositor_pid=$!
+        wait_socket "${socket}" || return 1
+        WAYLAND_DISPLAY="${socket}" run_ignis
+    elif command -v cage >/dev/null; then
+        WLR_BACKENDS=headless WLR_LIBINPUT_NO_DEVICES=1 cage -- "$0" --inner
+    else
+        logf "either weston or cage is required"
+        return 1
+    fi
+}
+
+if [ "$1" = "--inner" ]; then
+    run_ignis
+else
+    main "$@"
+fi